@@ -1,6 +1,36 @@
 import pytest
-import tempfile
-import os
+import requests
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, NamedTuple
+from unittest.mock import Mock
+from click.testing import CliRunner
+
+_SAMPLE_ID3_TAGS = MappingProxyType({
+    'TIT2': 'Test Title',
+    'TPE1': 'Test Artist',
+    'TALB': 'Test Album',
+    'TRCK': '1',
+    'TDRC': '2023'
+})
+
+
+@dataclass
+class FakeResponse:
+    """Plain stand-in for a requests.Response: status, body text and JSON payload."""
+    status_code: int = 200
+    text: str = ""
+    payload: Any = None
+
+    def json(self) -> Any:
+        return self.payload
+
+
+class PatchedRequest(NamedTuple):
+    """A patched session method and the FakeResponse it returns."""
+    response: FakeResponse
+    mock: Mock
 
 
 @pytest.fixture
@@ -11,29 +41,73 @@ def sample_mp3_path():
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield temp_dir
+def mock_mp3_file(tmp_path):
+    """Create a mock MP3 file in pytest's per-test temporary directory"""
+    mp3_path = tmp_path / "test.mp3"
+    mp3_path.write_bytes(b"mock mp3 content")
+    return str(mp3_path)
+
+
+@pytest.fixture(scope="session")
+def sample_id3_tags():
+    """Sample ID3 tags for testing (read-only; copy with dict() to mutate)"""
+    return _SAMPLE_ID3_TAGS
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """A single CLI runner shared by every CLI test in the session.
+
+    This is Click's runner: tests invoke the prebuilt Click command
+    (``typer.main.get_command(app)``) rather than the Typer app itself.
+    """
+    return CliRunner()
+
+
+@pytest.fixture
+def mock_bandcamp_post(monkeypatch):
+    """Patch Bandcamp's session POST and return it with the response it yields.
+
+    Tests set ``status_code``, ``payload`` or ``text`` on ``.response`` and
+    make call assertions on ``.mock``.
+    """
+    response = FakeResponse()
+    post = Mock(return_value=response)
+    monkeypatch.setattr(requests.Session, 'post', post)
+    return PatchedRequest(response, post)
 
 
 @pytest.fixture
-def mock_mp3_file(temp_dir):
-    """Create a mock MP3 file in temporary directory"""
-    mp3_path = os.path.join(temp_dir, "test.mp3")
-    # Create an empty file with .mp3 extension
-    with open(mp3_path, 'w') as f:
-        f.write("mock mp3 content")
-    return mp3_path
+def mock_artwork_get(monkeypatch):
+    """Patch the artwork downloader's session GET and return the mock.
+
+    Also starts the test with an empty artwork cache so earlier downloads of
+    the same URL are not served instead of calling the mock.
+    """
+    get = Mock()
+    monkeypatch.setattr(requests.Session, 'get', get)
+    monkeypatch.setattr('track_id.mp3_utils._artwork_cache', OrderedDict())
+    return get
 
 
 @pytest.fixture
-def sample_id3_tags():
-    """Sample ID3 tags for testing"""
-    return {
-        'TIT2': 'Test Title',
-        'TPE1': 'Test Artist',
-        'TALB': 'Test Album',
-        'TRCK': '1',
-        'TDRC': '2023'
-    } 
\ No newline at end of file
+def mock_musicbrainz_get(monkeypatch):
+    """Patch MusicBrainz's session GET and return it with the response it yields.
+
+    Mirrors ``mock_bandcamp_post``.
+    """
+    response = FakeResponse()
+    get = Mock(return_value=response)
+    monkeypatch.setattr(requests.Session, 'get', get)
+    return PatchedRequest(response, get)
+
+
+@pytest.fixture(autouse=True)
+def _no_response_cache(monkeypatch):
+    """Keep tests off the user's on-disk API response cache.
+
+    Tests that exercise the cache build their own ``ResponseCache`` under
+    ``tmp_path``.
+    """
+    from track_id.response_cache import response_cache
+    monkeypatch.setattr(response_cache, 'enabled', False)
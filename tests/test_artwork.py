@@ -1,111 +1,183 @@
 import pytest
-from unittest.mock import Mock, patch
+from dataclasses import dataclass, field
+from typing import Dict, List
 from track_id.mp3_utils import (
     download_artwork,
     get_mime_type,
     update_mp3_metadata,
     MAX_ARTWORK_SIZE,
 )
+from track_id import mp3_utils
 from track_id.bandcamp_api import BandcampDataSource
+from track_id.http_utils import BROWSER_USER_AGENT
+
+
+@dataclass
+class _FakeStreamingResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+    chunks: List[bytes] = field(default_factory=list)
+    headers: Dict[str, str] = field(default_factory=dict)
+    closed: bool = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
 
 
 def _make_streaming_response(chunks, content_length=None):
-    """Build a mock streaming response that yields the given chunks."""
-    mock_response = Mock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.headers = Mock()
-    mock_response.headers.get.return_value = content_length
-    mock_response.iter_content.return_value = iter(chunks)
-    return mock_response
+    """Build a fake streaming response that yields the given chunks."""
+    headers = {'Content-Length': content_length} if content_length else {}
+    return _FakeStreamingResponse(chunks=list(chunks), headers=headers)
 
 
 class TestArtworkFunctionality:
     """Test cases for artwork functionality"""
 
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_success(self, mock_get):
+    def test_download_artwork_success(self, mock_artwork_get):
         """Test successful artwork download within size limit"""
-        mock_get.return_value = _make_streaming_response([b'fake_', b'image_data'])
+        mock_artwork_get.return_value = _make_streaming_response([b'fake_', b'image_data'])
 
         result = download_artwork('https://example.com/artwork.jpg')
 
         assert result == b'fake_image_data'
-        mock_get.assert_called_once()
-
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_uses_streaming(self, mock_get):
+        mock_artwork_get.assert_called_once()
+
+    def test_download_artwork_cached_per_url(self, mock_artwork_get):
+        """Test that a cover shared by several tracks is downloaded once"""
+        mock_artwork_get.side_effect = lambda *a, **kw: _make_streaming_response([b'cover'])
+
+        first = download_artwork('https://example.com/artwork.jpg')
+        second = download_artwork('https://example.com/artwork.jpg')
+
+        assert first == second == b'cover'
+        mock_artwork_get.assert_called_once()
+
+    def test_download_artwork_failure_not_cached(self, mock_artwork_get):
+        """Test that a failed download is retried on the next call"""
+        mock_artwork_get.side_effect = [
+            Exception("Network error"),
+            _make_streaming_response([b'cover']),
+        ]
+
+        assert download_artwork('https://example.com/artwork.jpg') is None
+        assert download_artwork('https://example.com/artwork.jpg') == b'cover'
+
+    def test_download_artwork_served_from_disk_cache(self, mock_artwork_get, monkeypatch, tmp_path):
+        """Test that a cover downloaded in an earlier run is read from disk"""
+        from track_id.response_cache import ResponseCache
+        disk_cache = ResponseCache(tmp_path / "api.sqlite")
+        monkeypatch.setattr('track_id.response_cache.response_cache', disk_cache)
+        mock_artwork_get.side_effect = lambda *a, **kw: _make_streaming_response([b'cover'])
+
+        assert download_artwork('https://example.com/artwork.jpg') == b'cover'
+        monkeypatch.setattr('track_id.mp3_utils._artwork_cache', mp3_utils.OrderedDict())
+        assert download_artwork('https://example.com/artwork.jpg') == b'cover'
+
+        mock_artwork_get.assert_called_once()
+        assert disk_cache.get_bytes('artwork', 'https://example.com/artwork.jpg') == b'cover'
+
+    def test_download_artwork_reuses_one_session(self, mock_artwork_get, monkeypatch):
+        """Test that artwork downloads share one keep-alive session"""
+        monkeypatch.setattr('track_id.mp3_utils._artwork_session', None)
+        mock_artwork_get.side_effect = lambda *a, **kw: _make_streaming_response([b'cover'])
+
+        download_artwork('https://example.com/one.jpg')
+        first_session = mp3_utils._artwork_session
+        download_artwork('https://example.com/two.jpg')
+
+        assert first_session is not None
+        assert mp3_utils._artwork_session is first_session
+        assert first_session.headers['User-Agent'] == BROWSER_USER_AGENT
+        assert first_session.headers['Accept-Encoding'] == 'identity'
+        assert mock_artwork_get.call_count == 2
+
+    def test_download_artwork_uses_streaming(self, mock_artwork_get):
         """Test that download uses stream=True to avoid loading full response upfront"""
-        mock_get.return_value = _make_streaming_response([b'data'])
+        mock_artwork_get.return_value = _make_streaming_response([b'data'])
 
         download_artwork('https://example.com/artwork.jpg')
 
-        _, kwargs = mock_get.call_args
+        _, kwargs = mock_artwork_get.call_args
         assert kwargs.get('stream') is True
 
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_rejected_by_content_length_header(self, mock_get):
+    def test_download_artwork_rejected_by_content_length_header(self, mock_artwork_get):
         """Test that an oversized Content-Length header causes early rejection"""
         oversized = str(MAX_ARTWORK_SIZE + 1)
-        mock_get.return_value = _make_streaming_response([], content_length=oversized)
+        mock_artwork_get.return_value = _make_streaming_response([], content_length=oversized)
 
         result = download_artwork('https://example.com/artwork.jpg')
 
         assert result is None
 
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_rejected_mid_stream(self, mock_get):
+    def test_download_artwork_rejected_mid_stream(self, mock_artwork_get):
         """Test that a response exceeding the limit mid-stream is rejected"""
         # No Content-Length header, but body is too large
         oversized_chunk = b'x' * (MAX_ARTWORK_SIZE + 1)
-        mock_get.return_value = _make_streaming_response([oversized_chunk])
+        response = _make_streaming_response([oversized_chunk])
+        mock_artwork_get.return_value = response
 
         result = download_artwork('https://example.com/artwork.jpg')
 
         assert result is None
+        # The half-read body is released back to the shared session's pool
+        assert response.closed
 
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_accepted_at_exact_limit(self, mock_get):
+    def test_download_artwork_accepted_at_exact_limit(self, mock_artwork_get):
         """Test that a response exactly at the limit is accepted"""
         exact_chunk = b'x' * MAX_ARTWORK_SIZE
-        mock_get.return_value = _make_streaming_response([exact_chunk])
+        mock_artwork_get.return_value = _make_streaming_response([exact_chunk])
 
         result = download_artwork('https://example.com/artwork.jpg')
 
         assert result == exact_chunk
 
-    @patch('track_id.mp3_utils.requests.get')
-    def test_download_artwork_failure(self, mock_get):
+    def test_download_artwork_failure(self, mock_artwork_get):
         """Test artwork download failure"""
-        mock_get.side_effect = Exception("Network error")
+        mock_artwork_get.side_effect = Exception("Network error")
 
         result = download_artwork('https://example.com/artwork.jpg')
 
         assert result is None
     
-    def test_get_mime_type_from_url(self):
+    @pytest.mark.parametrize("url,expected", [
+        ('https://example.com/artwork.jpg', 'image/jpeg'),
+        ('https://example.com/artwork.png', 'image/png'),
+        ('https://example.com/artwork.gif', 'image/gif'),
+        ('https://example.com/artwork.webp', 'image/webp'),
+        ('https://example.com/artwork.PNG?token=abc', 'image/png'),
+        ('https://example.com/covers.png/artwork', 'image/jpeg'),
+    ])
+    def test_get_mime_type_from_url(self, url, expected):
         """Test MIME type detection from URL"""
-        assert get_mime_type('https://example.com/artwork.jpg', b'') == 'image/jpeg'
-        assert get_mime_type('https://example.com/artwork.png', b'') == 'image/png'
-        assert get_mime_type('https://example.com/artwork.gif', b'') == 'image/gif'
-        assert get_mime_type('https://example.com/artwork.webp', b'') == 'image/webp'
+        assert get_mime_type(url, b'') == expected
     
-    def test_get_mime_type_from_content(self):
-        """Test MIME type detection from content"""
-        # JPEG magic bytes
-        jpeg_data = b'\xff\xd8\xff\xe0\x00\x10JFIF'
-        assert get_mime_type('https://example.com/artwork', jpeg_data) == 'image/jpeg'
-        
-        # PNG magic bytes
-        png_data = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR'
-        assert get_mime_type('https://example.com/artwork', png_data) == 'image/png'
-        
-        # GIF magic bytes
-        gif_data = b'GIF87a\x00\x00\x00\x00'
-        assert get_mime_type('https://example.com/artwork', gif_data) == 'image/gif'
-        
-        # WebP magic bytes
-        webp_data = b'RIFF\x00\x00\x00\x00WEBP'
-        assert get_mime_type('https://example.com/artwork', webp_data) == 'image/webp'
+    @pytest.mark.parametrize("data,expected", [
+        (b'\xff\xd8\xff\xe0\x00\x10JFIF', 'image/jpeg'),
+        (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', 'image/png'),
+        (b'GIF87a\x00\x00\x00\x00', 'image/gif'),
+        (b'RIFF\x00\x00\x00\x00WEBP', 'image/webp'),
+        (b'GIF89a\x00\x00\x00\x00', 'image/gif'),
+        # Unrecognised content falls back to JPEG
+        (b'\x00\x00\x00\x00????', 'image/jpeg'),
+        (b'RIFF\x00\x00\x00\x00WAVE', 'image/jpeg'),
+        (b'GIF8', 'image/jpeg'),
+        (b'', 'image/jpeg'),
+    ])
+    def test_get_mime_type_from_content(self, data, expected):
+        """Test MIME type detection from content magic bytes"""
+        assert get_mime_type('https://example.com/artwork', data) == expected
+
+    def test_get_mime_type_content_overrides_url(self):
+        """Test that magic bytes win over a misleading URL extension"""
+        assert get_mime_type('https://example.com/artwork.jpg', b'\x89PNG\r\n\x1a\n') == 'image/png'
     
     def test_extract_bandcamp_metadata_with_artwork(self):
         """Test metadata extraction with artwork URL"""
@@ -1,27 +1,38 @@
 import pytest
-import os
-import tempfile
 from unittest.mock import Mock, patch
-from typer.testing import CliRunner
 from track_id import app
 from track_id.bandcamp_api import BandcampDataSource
 
 
+@pytest.fixture(scope="module")
+def bandcamp_results():
+    """Bandcamp autocomplete results shared by the matching tests (do not mutate)"""
+    return {
+        "auto": {
+            "results": [
+                {
+                    "type": "t",
+                    "name": "Test Track",
+                    "band_name": "Test Artist",
+                    "album_name": "Test Album"
+                },
+                {
+                    "type": "t",
+                    "name": "Another Track",
+                    "band_name": "Another Artist",
+                    "album_name": "Another Album"
+                }
+            ]
+        }
+    }
+
+
 class TestBandcampAPI:
     """Test cases for the Bandcamp API functionality"""
     
-    @pytest.fixture
-    def runner(self):
-        """Create a CLI runner for testing"""
-        return CliRunner()
-    
-    @patch('track_id.bandcamp_api.requests.post')
-    def test_search_bandcamp_success(self, mock_post):
+    def test_search_bandcamp_success(self, mock_bandcamp_post):
         """Test successful Bandcamp search"""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_bandcamp_post.response.payload = {
             "auto": {
                 "results": [
                     {
@@ -34,23 +45,42 @@ class TestBandcampAPI:
                 ]
             }
         }
-        mock_post.return_value = mock_response
         
         source = BandcampDataSource()
         result = source.search("test track")
         
         assert result["auto"]["results"][0]["name"] == "Test Track"
         assert result["auto"]["results"][0]["band_name"] == "Test Artist"
-        mock_post.assert_called_once()
+        mock_bandcamp_post.mock.assert_called_once()
     
-    @patch('track_id.bandcamp_api.requests.post')
-    def test_search_bandcamp_error(self, mock_post):
+    def test_search_bandcamp_cached_per_query(self, mock_bandcamp_post):
+        """Test that repeating a search does not issue a second request"""
+        mock_bandcamp_post.response.payload = {"auto": {"results": []}}
+
+        source = BandcampDataSource()
+        source.search("test track")
+        source.search("test track")
+        source.search("other track")
+
+        assert mock_bandcamp_post.mock.call_count == 2
+    
+    def test_search_bandcamp_rate_limited(self, mock_bandcamp_post, monkeypatch):
+        """Test that each uncached search waits on the Bandcamp rate limiter"""
+        mock_bandcamp_post.response.payload = {"auto": {"results": []}}
+        source = BandcampDataSource()
+        waits = []
+        monkeypatch.setattr(source._rate_limiter, 'wait', lambda: waits.append(1))
+
+        source.search("test track")
+        source.search("test track")
+        source.search("other track")
+
+        assert len(waits) == 2
+
+    def test_search_bandcamp_error(self, mock_bandcamp_post):
         """Test Bandcamp search with API error"""
-        # Mock failed API response
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
-        mock_post.return_value = mock_response
+        mock_bandcamp_post.response.status_code = 500
+        mock_bandcamp_post.response.text = "Internal Server Error"
         
         source = BandcampDataSource()
         with pytest.raises(Exception) as exc_info:
@@ -58,54 +88,58 @@ class TestBandcampAPI:
         
         assert "Bandcamp API error: 500" in str(exc_info.value)
     
-    def test_find_matching_track_success(self):
+    def test_find_matching_track_success(self, bandcamp_results):
         """Test finding matching track in search results"""
-        search_results = {
-            "auto": {
-                "results": [
-                    {
-                        "type": "t",
-                        "name": "Test Track",
-                        "band_name": "Test Artist",
-                        "album_name": "Test Album"
-                    },
-                    {
-                        "type": "t",
-                        "name": "Another Track",
-                        "band_name": "Another Artist",
-                        "album_name": "Another Album"
-                    }
-                ]
-            }
-        }
-        
         source = BandcampDataSource()
-        result = source.find_matching_track(search_results, "Test Artist", "Test Track")
+        result = source.find_matching_track(bandcamp_results, "Test Artist", "Test Track")
         
         assert result is not None
         assert result["name"] == "Test Track"
         assert result["band_name"] == "Test Artist"
     
-    def test_find_matching_track_no_match(self):
+    def test_find_matching_track_no_match(self, bandcamp_results):
         """Test finding matching track with no match"""
-        search_results = {
-            "auto": {
-                "results": [
-                    {
-                        "type": "t",
-                        "name": "Different Track",
-                        "band_name": "Different Artist",
-                        "album_name": "Different Album"
-                    }
-                ]
-            }
-        }
-        
         source = BandcampDataSource()
-        result = source.find_matching_track(search_results, "Test Artist", "Test Track")
+        result = source.find_matching_track(bandcamp_results, "Different Artist", "Different Track")
         
         assert result is None
     
+    def test_find_matching_track_prefers_exact_over_earlier_partial(self):
+        """Test an exact hit beats a partial match listed before it"""
+        results = {"auto": {"results": [
+            {"type": "t", "name": "Test Track (Remix)", "band_name": "Test Artist"},
+            {"type": "t", "name": "TEST TRACK", "band_name": "test artist"},
+        ]}}
+
+        source = BandcampDataSource()
+        result = source.find_matching_track(results, "Test Artist", "Test Track")
+
+        assert result is results["auto"]["results"][1]
+    
+    def test_find_matching_track_partial_needs_whole_words(self):
+        """Test a name merely containing the artist as a substring is not a partial match"""
+        results = {"auto": {"results": [
+            {"type": "t", "name": "Test Track", "band_name": "Fairport Convention"},
+            {"type": "t", "name": "Test Track (Live)", "band_name": "Air"},
+        ]}}
+
+        source = BandcampDataSource()
+        result = source.find_matching_track(results, "Air", "Test Track")
+
+        assert result is results["auto"]["results"][1]
+
+    def test_find_matching_track_fuzzy_fallback(self):
+        """Test a spelling near-miss is matched when no partial match exists"""
+        results = {"auto": {"results": [
+            {"type": "a", "name": "Hoppípolla", "band_name": "Sigur Rós"},
+            {"type": "t", "name": "Hoppípolla", "band_name": "Sigur Rós"},
+        ]}}
+
+        source = BandcampDataSource()
+        result = source.find_matching_track(results, "Sigur Ros", "Hoppipolla")
+
+        assert result is results["auto"]["results"][1]
+    
     def test_extract_bandcamp_metadata(self):
         """Test extracting metadata from Bandcamp track data"""
         track_data = {
@@ -140,7 +174,7 @@ class TestBandcampAPI:
         assert "artwork_url" not in metadata
     
     @patch('track_id.data_sources.MP3File')
-    def test_enrich_mp3_file_bandcamp_success(self, mock_mp3_file_class):
+    def test_enrich_mp3_file_bandcamp_success(self, mock_mp3_file_class, monkeypatch):
         """Test successful MP3 enrichment with Bandcamp"""
         # Mock MP3File instance
         mock_mp3_file = Mock()
@@ -156,32 +190,21 @@ class TestBandcampAPI:
         mock_mp3_file_class.return_value = mock_mp3_file
         
         source = BandcampDataSource()
+        track = {
+            "type": "t",
+            "name": "Test Track",
+            "band_name": "Test Artist",
+            "album_name": "Test Album",
+            "art_id": "1234567890"
+        }
+        monkeypatch.setattr(source, 'search', Mock(return_value={"auto": {"results": [track]}}))
+        monkeypatch.setattr(source, 'find_matching_track', Mock(return_value=track))
         
-        # Mock the search method
-        with patch.object(source, 'search', return_value={
-            "auto": {
-                "results": [
-                    {
-                        "type": "t",
-                        "name": "Test Track",
-                        "band_name": "Test Artist",
-                        "album_name": "Test Album",
-                        "art_id": "1234567890"
-                    }
-                ]
-            }
-        }):
-            with patch.object(source, 'find_matching_track', return_value={
-                "name": "Test Track",
-                "band_name": "Test Artist",
-                "album_name": "Test Album",
-                "art_id": "1234567890"
-            }):
-                result = source.enrich_mp3_file("test.mp3")
-                
-                assert result["file_path"] == "test.mp3"
-                assert result["bandcamp_metadata"]["TALB"] == "Test Album"
-                assert result["added_metadata"]["TALB"] == "Test Album"
+        result = source.enrich_mp3_file("test.mp3")
+        
+        assert result["file_path"] == "test.mp3"
+        assert result["bandcamp_metadata"]["TALB"] == "Test Album"
+        assert result["added_metadata"]["TALB"] == "Test Album"
     
     @patch('track_id.data_sources.MP3File')
     def test_enrich_mp3_file_bandcamp_no_metadata(self, mock_mp3_file_class):
@@ -199,7 +222,7 @@ class TestBandcampAPI:
         assert "missing artist and title metadata" in str(exc_info.value)
     
     @patch('track_id.data_sources.MP3File')
-    def test_enrich_mp3_file_bandcamp_no_match(self, mock_mp3_file_class):
+    def test_enrich_mp3_file_bandcamp_no_match(self, mock_mp3_file_class, monkeypatch):
         """Test enrichment with no matching track found"""
         # Mock MP3File instance
         mock_mp3_file = Mock()
@@ -211,11 +234,10 @@ class TestBandcampAPI:
         mock_mp3_file_class.return_value = mock_mp3_file
         
         source = BandcampDataSource()
+        monkeypatch.setattr(source, 'search', Mock(return_value={"auto": {"results": []}}))
+        monkeypatch.setattr(source, 'find_matching_track', Mock(return_value=None))
+        
+        with pytest.raises(ValueError) as exc_info:
+            source.enrich_mp3_file("test.mp3")
         
-        # Mock the search method to return empty results
-        with patch.object(source, 'search', return_value={"auto": {"results": []}}):
-            with patch.object(source, 'find_matching_track', return_value=None):
-                with pytest.raises(ValueError) as exc_info:
-                    source.enrich_mp3_file("test.mp3")
-                
-                assert "No matching track found on Bandcamp" in str(exc_info.value)
+        assert "No matching track found on Bandcamp" in str(exc_info.value)
@@ -1,14 +1,23 @@
 """Tests for data_sources.py core aggregation logic."""
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 
 from track_id.data_sources import (
+    CircuitBreaker,
+    CircuitOpenError,
     DataSource,
     DataSourceRegistry,
     search_all_sources,
     enrich_with_all_sources,
+    enrich_many_with_all_sources,
+    best_fuzzy_match,
     extract_artist_name_from_credits,
+    tokens_overlap,
+    word_tokens,
 )
 
 
@@ -43,6 +52,117 @@ def _make_mp3(artist="Test Artist", title="Test Track", parsed=("", ""), added=N
     return mp3
 
 
+class TestBestFuzzyMatch:
+    def test_accent_near_miss_matches(self):
+        candidates = [("Sigur Rós Hoppípolla", "a"), ("Sigur Rós Glósóli", "b")]
+        assert best_fuzzy_match(candidates, "Sigur Ros Hoppipolla") == "a"
+
+    def test_unrelated_candidates_below_cutoff(self):
+        candidates = [("Test Artist Test Track", "a")]
+        assert best_fuzzy_match(candidates, "Different Artist Different Track") is None
+
+    def test_picks_highest_scoring_candidate(self):
+        candidates = [("Burial Archangel (Edit)", "edit"), ("Burial  Archangel", "original")]
+        assert best_fuzzy_match(candidates, "Burial Archangel") == "original"
+
+    def test_tie_keeps_earlier_candidate(self):
+        candidates = [("Burial Archangel!", "first"), ("Burial Archangel?", "second")]
+        assert best_fuzzy_match(candidates, "Burial Archangel") == "first"
+
+    def test_no_candidates(self):
+        assert best_fuzzy_match([], "anything") is None
+
+
+class TestTokensOverlap:
+    def test_word_tokens_casefolds_and_drops_punctuation(self):
+        assert word_tokens("Hoppipolla (Remastered)") == {"hoppipolla", "remastered"}
+
+    def test_contained_words_overlap(self):
+        assert tokens_overlap(word_tokens("Hoppipolla"), word_tokens("Hoppipolla (Remastered)"))
+        assert tokens_overlap(word_tokens("Hoppipolla (Remastered)"), word_tokens("Hoppipolla"))
+
+    def test_substring_inside_a_word_does_not_overlap(self):
+        assert not tokens_overlap(word_tokens("Air"), word_tokens("Fairport Convention"))
+
+    def test_empty_query_overlaps_anything(self):
+        assert tokens_overlap(word_tokens(""), word_tokens("Any Artist"))
+
+
+class TestCircuitBreaker:
+    @staticmethod
+    def _fail():
+        raise Exception("API error: 503")
+
+    def _trip(self, breaker, times=3):
+        for _ in range(times):
+            with pytest.raises(Exception, match="503"):
+                breaker.call(self._fail)
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("Bandcamp", fail_max=3)
+        self._trip(breaker)
+
+        func = Mock()
+        with pytest.raises(CircuitOpenError, match="Bandcamp skipped after 3 consecutive failures"):
+            breaker.call(func)
+        func.assert_not_called()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("Bandcamp", fail_max=3)
+        self._trip(breaker, times=2)
+        assert breaker.call(lambda: "ok") == "ok"
+        self._trip(breaker, times=2)
+
+        assert breaker.call(lambda: "still closed") == "still closed"
+
+    def test_trial_call_after_reset_timeout(self, monkeypatch):
+        breaker = CircuitBreaker("Bandcamp", fail_max=3, reset_timeout=60)
+        self._trip(breaker)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        assert breaker.call(lambda: "recovered") == "recovered"
+        assert breaker.call(lambda: "closed") == "closed"
+
+    def test_only_one_trial_while_half_open(self, monkeypatch):
+        breaker = CircuitBreaker("Bandcamp", fail_max=3, reset_timeout=60)
+        self._trip(breaker)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        concurrent = Mock()
+
+        def trial():
+            # Another caller arriving before the trial resolves fails fast.
+            with pytest.raises(CircuitOpenError, match="trial request is in progress"):
+                breaker.call(concurrent)
+            return "recovered"
+
+        assert breaker.call(trial) == "recovered"
+        concurrent.assert_not_called()
+        assert breaker.call(lambda: "closed") == "closed"
+
+    def test_failed_trial_reopens_immediately(self, monkeypatch):
+        breaker = CircuitBreaker("Bandcamp", fail_max=3, reset_timeout=60)
+        self._trip(breaker)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+        self._trip(breaker, times=1)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "rejected")
+
+    def test_no_match_does_not_count_as_failure(self):
+        source = _FakeSource({})
+        source.find_matching_track = lambda *args: None
+
+        for _ in range(10):
+            with pytest.raises(ValueError, match="No matching track"):
+                source.fetch_metadata("Artist", "Title")
+
+        assert source._circuit.call(lambda: "closed") == "closed"
+
+
 class TestDataSourceRegistry:
     def test_starts_empty(self):
         registry = DataSourceRegistry()
@@ -171,6 +291,21 @@ class TestSearchAllSources:
 
         assert results["Bandcamp"]["source"] is source
 
+    @patch("track_id.data_sources.data_source_registry")
+    def test_sources_are_queried_concurrently(self, mock_registry):
+        barrier = threading.Barrier(2, timeout=5)
+        sources = [_make_source("Bandcamp"), _make_source("MusicBrainz")]
+        for source in sources:
+            source.search.side_effect = lambda query: barrier.wait()
+        mock_registry.get_all_sources.return_value = sources
+
+        results = search_all_sources("query")
+
+        # Each search blocks until the other has started, so a sequential
+        # fan-out would break the barrier instead of succeeding.
+        assert list(results) == ["Bandcamp", "MusicBrainz"]
+        assert all(result["success"] for result in results.values())
+
 
 class TestEnrichWithAllSources:
     @patch("track_id.data_sources.MP3File")
@@ -250,6 +385,52 @@ class TestEnrichWithAllSources:
         # update_metadata is called exactly once with the merged dict.
         mp3.update_metadata.assert_called_once_with({"TALB": "BC Album", "TDRC": "2024"})
 
+    @patch("track_id.data_sources.download_artwork")
+    @patch("track_id.data_sources.MP3File")
+    @patch("track_id.data_sources.data_source_registry")
+    def test_winning_artwork_prefetched_during_fetch(self, mock_registry, mock_mp3_class, mock_download):
+        """The cover the merge will use is downloaded while sources are queried."""
+        mock_mp3_class.return_value = _make_mp3()
+        mock_registry.get_all_sources.return_value = [
+            _make_source("Bandcamp", fetch_raises=Exception("bc down")),
+            _make_source("MusicBrainz", source_metadata={"artwork_url": "https://caa/front"}),
+            _make_source("Discogs", source_metadata={"artwork_url": "https://discogs/cover"}),
+        ]
+
+        enrich_with_all_sources("test.mp3")
+
+        mock_download.assert_called_once_with("https://caa/front")
+
+    @patch("track_id.data_sources.data_source_registry")
+    def test_failed_artwork_prefetch_not_retried_on_write(self, mock_registry, mock_artwork_get, tmp_path):
+        """A cover that failed to prefetch is not downloaded (and warned about) again."""
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes(b"")
+        mock_artwork_get.side_effect = Exception("Network error")
+        mock_registry.get_all_sources.return_value = [
+            _make_source("Bandcamp", source_metadata={"TALB": "Album", "artwork_url": "https://bc/cover"}),
+        ]
+
+        result = enrich_with_all_sources(str(path))
+
+        mock_artwork_get.assert_called_once()
+        assert result["successful_enrichment"]["added_metadata"] == {"TALB": "Album"}
+
+    @patch("track_id.data_sources.download_artwork")
+    @patch("track_id.data_sources.MP3File")
+    @patch("track_id.data_sources.data_source_registry")
+    def test_artwork_not_prefetched_when_file_has_cover(self, mock_registry, mock_mp3_class, mock_download):
+        mp3 = _make_mp3()
+        mp3.metadata["APIC:"] = "Artwork (image/jpeg)"
+        mock_mp3_class.return_value = mp3
+        mock_registry.get_all_sources.return_value = [
+            _make_source("Bandcamp", source_metadata={"artwork_url": "https://bc/cover"}),
+        ]
+
+        enrich_with_all_sources("test.mp3")
+
+        mock_download.assert_not_called()
+
     @patch("track_id.data_sources.MP3File")
     @patch("track_id.data_sources.data_source_registry")
     def test_all_sources_fail_raises_value_error(self, mock_registry, mock_mp3_class):
@@ -308,6 +489,82 @@ class TestEnrichWithAllSources:
         assert result["file_path"] == "my_track.mp3"
 
 
+class TestEnrichSkipsCompleteFiles:
+    @staticmethod
+    def _complete_mp3():
+        mp3 = _make_mp3()
+        mp3.metadata.update({"TALB": "Album", "TDRC": "2024", "APIC:": "Artwork (image/jpeg)"})
+        return mp3
+
+    @patch("track_id.data_sources.MP3File")
+    @patch("track_id.data_sources.data_source_registry")
+    def test_complete_file_queries_no_source(self, mock_registry, mock_mp3_class):
+        mp3 = self._complete_mp3()
+        mock_mp3_class.return_value = mp3
+        source = _make_source("Bandcamp")
+        mock_registry.get_all_sources.return_value = [source]
+
+        result = enrich_with_all_sources("test.mp3")
+
+        assert result["skipped"] is True
+        assert result["existing_metadata"]["TALB"] == "Album"
+        source.fetch_metadata.assert_not_called()
+        mp3.update_metadata.assert_not_called()
+
+    @patch("track_id.data_sources.MP3File")
+    @patch("track_id.data_sources.data_source_registry")
+    def test_force_enriches_complete_file(self, mock_registry, mock_mp3_class):
+        mock_mp3_class.return_value = self._complete_mp3()
+        source = _make_source("Bandcamp", source_metadata={"TCON": "Electronic"})
+        mock_registry.get_all_sources.return_value = [source]
+
+        result = enrich_with_all_sources("test.mp3", force=True)
+
+        assert "skipped" not in result
+        source.fetch_metadata.assert_called_once()
+
+    @patch("track_id.data_sources.MP3File")
+    @patch("track_id.data_sources.data_source_registry")
+    def test_missing_artwork_is_not_complete(self, mock_registry, mock_mp3_class):
+        mp3 = _make_mp3()
+        mp3.metadata.update({"TALB": "Album", "TDRC": "2024"})
+        mock_mp3_class.return_value = mp3
+        source = _make_source("Bandcamp")
+        mock_registry.get_all_sources.return_value = [source]
+
+        enrich_with_all_sources("test.mp3")
+
+        source.fetch_metadata.assert_called_once()
+
+
+class TestEnrichManyWithAllSources:
+    @patch("track_id.data_sources.enrich_with_all_sources")
+    def test_results_keyed_by_path_in_input_order(self, mock_enrich):
+        mock_enrich.side_effect = lambda path, force: {"file_path": path}
+
+        results = enrich_many_with_all_sources(["b.mp3", "a.mp3", "c.mp3"], max_workers=3)
+
+        assert list(results) == ["b.mp3", "a.mp3", "c.mp3"]
+        assert results["a.mp3"] == {"success": True, "data": {"file_path": "a.mp3"}}
+
+    @patch("track_id.data_sources.enrich_with_all_sources")
+    def test_one_failure_does_not_stop_the_batch(self, mock_enrich):
+        def enrich(path, force):
+            if path == "bad.mp3":
+                raise ValueError("No data source could enrich the file 'bad.mp3'")
+            return {"file_path": path}
+        mock_enrich.side_effect = enrich
+
+        results = enrich_many_with_all_sources(["good.mp3", "bad.mp3"])
+
+        assert results["good.mp3"]["success"] is True
+        assert results["bad.mp3"]["success"] is False
+        assert "No data source could enrich" in results["bad.mp3"]["error"]
+
+    def test_empty_batch(self):
+        assert enrich_many_with_all_sources([]) == {}
+
+
 class _FakeMP3File:
     """Mimics MP3File's cache-invalidation: after update_metadata, `metadata`
     reflects the post-update state (the newly added fields are now on the file)."""
@@ -358,6 +615,18 @@ class TestEnrichExistingMetadataSnapshot:
         assert "TDRC" not in result["existing_metadata"]
 
 
+    def test_accepts_loaded_mp3_file(self):
+        fake_mp3 = _FakeMP3File({"TPE1": "Test Artist", "TIT2": "Test Track"})
+        fake_mp3.file_path = "track.mp3"
+
+        with patch("track_id.data_sources.MP3File") as mock_mp3_class:
+            result = _FakeSource({"TALB": "New Album"}).enrich_mp3_file(fake_mp3)
+
+        mock_mp3_class.assert_not_called()
+        assert result["file_path"] == "track.mp3"
+        assert result["added_metadata"] == {"TALB": "New Album"}
+
+
 class TestExtractArtistNameFromCredits:
     def test_empty_list(self):
         assert extract_artist_name_from_credits([]) == ""
@@ -1,6 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from track_id.discogs_api import DiscogsDataSource
+from track_id.response_cache import ResponseCache
 
 SAMPLE_SEARCH_RESULTS = {
     "results": [
@@ -60,6 +61,20 @@ class TestDiscogsSearch:
         assert params["q"] == "DJ Krush Ha Doh"
         assert params["type"] == "release"
 
+    @patch("track_id.data_sources.time.sleep")
+    def test_search_served_from_disk_cache(self, mock_sleep, tmp_path, monkeypatch):
+        """A fresh source instance reuses the stored response instead of the API."""
+        monkeypatch.setattr("track_id.discogs_api.response_cache", ResponseCache(tmp_path / "api.sqlite"))
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = SAMPLE_SEARCH_RESULTS
+        with patch("requests.Session.get", return_value=mock_response) as mock_get:
+            DiscogsDataSource().search("DJ Krush - Ha Doh")
+            result = DiscogsDataSource().search("DJ Krush - Ha Doh")
+
+        assert result == SAMPLE_SEARCH_RESULTS
+        mock_get.assert_called_once()
+
     @patch("track_id.data_sources.time.sleep")
     def test_search_handles_multilingual_title(self, mock_sleep, source):
         """Titles with embedded ' - ' (multilingual) must not break the query."""
@@ -72,6 +72,11 @@ class TestFilenameParserMissingParts:
         # "Artist - " — title is whitespace only after strip
         assert mp3(tmp_path, "Artist - ").parsed_filename == ("", "")
 
+    def test_leading_dash_splits_at_next_dash(self, tmp_path):
+        # The artist group needs at least one character, so a leading dash
+        # belongs to the artist and the split happens at the next one
+        assert mp3(tmp_path, "-Artist - Title").parsed_filename == ("-Artist", "Title")
+
 
 class TestFilenameParserUnicode:
     def test_accented_characters(self, tmp_path):
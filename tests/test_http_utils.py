@@ -0,0 +1,37 @@
+"""Tests for http_utils.py shared HTTP configuration."""
+
+import pytest
+
+from track_id.http_utils import API_HEADERS, BROWSER_HEADERS, create_session
+
+
+class TestCreateSession:
+    def test_headers_applied(self):
+        session = create_session({"User-Agent": "track-id-test"})
+        assert session.headers["User-Agent"] == "track-id-test"
+
+    def test_retries_transient_errors_only(self):
+        retry = create_session({}).get_adapter("https://example.org").max_retries
+
+        assert retry.total == 4
+        assert {429, 500, 502, 503, 504} <= set(retry.status_forcelist)
+        assert 404 not in retry.status_forcelist
+        assert {"GET", "POST"} <= set(retry.allowed_methods)
+        # The final response is handed back so callers report the API error.
+        assert retry.raise_on_status is False
+        assert retry.respect_retry_after_header is True
+
+    def test_backoff_factor(self):
+        retry = create_session({}, backoff_factor=1.0).get_adapter("https://example.org").max_retries
+
+        assert retry.backoff_factor == 1.0
+
+
+class TestSharedHeaders:
+    @pytest.mark.parametrize("headers", [API_HEADERS, BROWSER_HEADERS])
+    def test_headers_are_read_only(self, headers):
+        with pytest.raises(TypeError):
+            headers["User-Agent"] = "changed"
+
+    def test_brotli_not_advertised(self):
+        assert "br" not in BROWSER_HEADERS["Accept-Encoding"]
@@ -1,22 +1,43 @@
 import pytest
-import os
-import tempfile
 from unittest.mock import patch, Mock
-from typer.testing import CliRunner
+from typer.main import get_command
 from track_id import app
 
+# Build the Click command tree once instead of on every runner.invoke.
+_CLICK_APP = get_command(app)
+
+
+@pytest.fixture(scope="module")
+def info_result(runner):
+    """Run the info command once against a mocked MP3 file and share the result"""
+    with patch('track_id.track_id.MP3File') as mock_mp3_file_class:
+        # Mock MP3File instance
+        mock_mp3_file = Mock()
+        mock_mp3_file.info = {
+            'file_path': 'Chaos In The CBD - Midnight In Peckham - 04 Midnight In Peckham.mp3',
+            'file_size': 2048000,
+            'duration_seconds': 245.3,
+            'bitrate': 320000,
+            'sample_rate': 44100
+        }
+        mock_mp3_file.metadata = {
+            'TIT2': 'Midnight In Peckham',
+            'TPE1': 'Chaos In The CBD',
+            'TALB': 'Midnight In Peckham',
+            'TRCK': '4',
+            'TDRC': '2023'
+        }
+        mock_mp3_file_class.return_value = mock_mp3_file
+        
+        return runner.invoke(_CLICK_APP, ["info", "Chaos In The CBD - Midnight In Peckham - 04 Midnight In Peckham.mp3"])
+
 
 class TestIntegration:
     """Integration tests for the track-id application"""
     
-    @pytest.fixture
-    def runner(self):
-        """Create a CLI runner for testing"""
-        return CliRunner()
-    
     def test_full_search_workflow(self, runner):
         """Test the complete search workflow"""
-        with patch('track_id.track_id.unified_search') as mock_search:
+        with patch('track_id.unified_api.search') as mock_search:
             # Mock successful API response
             mock_search.return_value = {
                 "bandcamp": {
@@ -39,79 +60,54 @@ class TestIntegration:
                 }
             }
             
-            result = runner.invoke(app, ["search", "Chaos In The CBD"])
+            result = runner.invoke(_CLICK_APP, ["search", "Chaos In The CBD"])
             
             assert result.exit_code == 0
             assert "Midnight In Peckham" in result.output
             assert "Chaos In The CBD" in result.output
     
-    def test_full_info_workflow(self, runner):
+    def test_full_info_workflow_succeeds(self, info_result):
+        """Test the complete info workflow exits cleanly"""
+        assert info_result.exit_code == 0
+    
+    @pytest.mark.parametrize("expected", [
+        "Chaos In The CBD",
+        "Midnight In Peckham",
+        "4:05",  # Duration
+        "320 kbps",  # Bitrate
+        "44100 Hz",  # Sample rate
+        "1.95 MB",  # File size
+    ])
+    def test_full_info_workflow(self, info_result, expected):
         """Test the complete info workflow with a real-like MP3 file"""
-        with patch('track_id.track_id.MP3File') as mock_mp3_file_class:
-            # Mock MP3File instance
-            mock_mp3_file = Mock()
-            mock_mp3_file.info = {
-                'file_path': 'Chaos In The CBD - Midnight In Peckham - 04 Midnight In Peckham.mp3',
-                'file_size': 2048000,
-                'duration_seconds': 245.3,
-                'bitrate': 320000,
-                'sample_rate': 44100
-            }
-            mock_mp3_file.metadata = {
-                'TIT2': 'Midnight In Peckham',
-                'TPE1': 'Chaos In The CBD',
-                'TALB': 'Midnight In Peckham',
-                'TRCK': '4',
-                'TDRC': '2023'
-            }
-            mock_mp3_file_class.return_value = mock_mp3_file
-            
-            result = runner.invoke(app, ["info", "Chaos In The CBD - Midnight In Peckham - 04 Midnight In Peckham.mp3"])
-            
-            assert result.exit_code == 0
-            assert "Chaos In The CBD" in result.output
-            assert "Midnight In Peckham" in result.output
-            assert "4:05" in result.output  # Duration
-            assert "320 kbps" in result.output  # Bitrate
-            assert "44100 Hz" in result.output  # Sample rate
-            assert "1.95 MB" in result.output  # File size
+        assert expected in info_result.output
     
     def test_error_handling_workflow(self, runner):
         """Test error handling in the complete workflow"""
         # Test with invalid search
-        with patch('track_id.track_id.unified_search') as mock_search:
+        with patch('track_id.unified_api.search') as mock_search:
             mock_search.side_effect = Exception("Internal Server Error")
             
-            result = runner.invoke(app, ["search", "invalid search"])
+            result = runner.invoke(_CLICK_APP, ["search", "invalid search"])
             
             assert result.exit_code == 1
             assert "Internal Server Error" in result.output
         
         # Test with invalid file
-        result = runner.invoke(app, ["info", "nonexistent.mp3"])
+        result = runner.invoke(_CLICK_APP, ["info", "nonexistent.mp3"])
         assert result.exit_code == 1
         assert "does not exist" in result.output
     
-    def test_cli_help_workflow(self, runner):
+    @pytest.mark.parametrize("command,expected", [
+        ([], "search"),
+        ([], "info"),
+        ([], "enrich"),
+        (["search"], "search"),
+        (["info"], "info"),
+        (["enrich"], "enrich"),
+    ])
+    def test_cli_help_workflow(self, runner, command, expected):
         """Test that help commands work correctly"""
-        # Test main help
-        result = runner.invoke(app, ["--help"])
-        assert result.exit_code == 0
-        assert "search" in result.output
-        assert "info" in result.output
-        assert "enrich" in result.output
-        
-        # Test search help
-        result = runner.invoke(app, ["search", "--help"])
-        assert result.exit_code == 0
-        assert "search" in result.output
-        
-        # Test info help
-        result = runner.invoke(app, ["info", "--help"])
-        assert result.exit_code == 0
-        assert "info" in result.output
-        
-        # Test enrich help
-        result = runner.invoke(app, ["enrich", "--help"])
+        result = runner.invoke(_CLICK_APP, command + ["--help"])
         assert result.exit_code == 0
-        assert "enrich" in result.output 
\ No newline at end of file
+        assert expected in result.output
@@ -0,0 +1,99 @@
+"""Tests for MP3File tag parsing and writing in mp3_utils.py."""
+
+from unittest.mock import patch
+
+import pytest
+from mutagen.id3 import ID3, TALB
+
+from track_id.mp3_utils import MP3File
+
+
+class TestMP3FileTagParsing:
+    def test_update_reuses_tags_parsed_for_metadata(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes(b"")
+        mp3 = MP3File(str(path))
+
+        with patch("track_id.mp3_utils.ID3", wraps=ID3) as id3_class:
+            mp3.metadata
+            mp3.update_metadata({"TALB": "Album"})
+            assert mp3.metadata["TALB"] == "Album"
+
+        # One parse attempt of the (tagless) file plus one empty ID3 to fill in;
+        # update_metadata and the refreshed metadata read neither again.
+        assert id3_class.call_count == 2
+        assert ID3(str(path))["TALB"].text == ["Album"]
+
+    def test_info_shares_parsed_tags_with_metadata(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)  # 128 kbps frames
+        tags = ID3()
+        tags["TALB"] = TALB(encoding=3, text="Album")
+        tags.save(str(path))
+        mp3 = MP3File(str(path))
+
+        with patch("track_id.mp3_utils.ID3", wraps=ID3) as id3_class:
+            assert mp3.info["bitrate"] == 128000
+            assert mp3.metadata["TALB"] == "Album"
+
+        id3_class.assert_not_called()
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="does not exist"):
+            MP3File(str(tmp_path / "missing.mp3"))
+
+    def test_path_through_a_file_raises_not_found(self, tmp_path):
+        (tmp_path / "file").write_text("")
+        with pytest.raises(FileNotFoundError, match="does not exist"):
+            MP3File(str(tmp_path / "file" / "track.mp3"))
+
+    def test_update_resets_cached_file_size(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes(b"")
+        mp3 = MP3File(str(path))
+        assert mp3._file_size == 0
+
+        mp3.update_metadata({"TALB": "Album"})
+
+        assert mp3._file_size is None
+        assert mp3._info is None
+
+    def test_update_with_nothing_new_does_not_write(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes(b"")
+        mp3 = MP3File(str(path))
+        mp3.update_metadata({"TALB": "Album"})
+        mtime = path.stat().st_mtime_ns
+
+        with patch.object(ID3, "save") as save:
+            added = mp3.update_metadata({"TALB": "Other Album", "unknown": "x"})
+
+        assert added == {}
+        save.assert_not_called()
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_update_keeps_existing_padding(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+        ID3().save(str(path), padding=lambda info: 64 * 1024)
+        size = path.stat().st_size
+
+        MP3File(str(path)).update_metadata({"TALB": "Album"})
+
+        # mutagen's default would trim padding this large and rewrite the file
+        assert path.stat().st_size == size
+        assert ID3(str(path))["TALB"].text == ["Album"]
+
+    def test_update_pads_a_new_tag(self, tmp_path):
+        path = tmp_path / "Artist - Title.mp3"
+        path.write_bytes(b"")
+
+        MP3File(str(path)).update_metadata({"TALB": "Album"})
+
+        # Room is left so later tag edits rewrite the header in place.
+        unpadded = tmp_path / "unpadded.mp3"
+        unpadded.write_bytes(b"")
+        tags = ID3()
+        tags["TALB"] = TALB(encoding=3, text="Album")
+        tags.save(str(unpadded), padding=lambda info: 0)
+        assert path.stat().st_size - unpadded.stat().st_size >= 4096
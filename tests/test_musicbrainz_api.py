@@ -1,290 +1,387 @@
 import pytest
 import os
 import tempfile
-from unittest.mock import Mock, patch, mock_open
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock
 from mutagen.id3 import ID3
-from typer.testing import CliRunner
-from track_id import app
 from track_id.mp3_utils import MP3File
-from track_id.musicbrainz_api import MusicBrainzDataSource
+from track_id.musicbrainz_api import (
+    MUSICBRAINZ_API_BASE,
+    MUSICBRAINZ_RECORDING_ID_KEY,
+    MUSICBRAINZ_THROTTLED_INTERVAL,
+    MusicBrainzDataSource,
+)
 
 
-class TestMusicBrainzAPI:
-    """Test cases for the MusicBrainz API functionality"""
+# Shared, read-only MusicBrainz payloads. Credits stay plain dicts because
+# extract_artist_name_from_credits checks isinstance(credit, dict).
+_RECORDING = MappingProxyType({
+    "id": "test-id-1",
+    "title": "Test Track",
+    "artist-credit": ({"name": "Test Artist"},),
+})
+_OTHER_RECORDING = MappingProxyType({
+    "id": "test-id-2",
+    "title": "Another Track",
+    "artist-credit": ({"name": "Another Artist"},),
+})
+_SEARCH_RESULTS = MappingProxyType({"recordings": (_RECORDING,)})
+
+
+@pytest.fixture
+def mp3_mock():
+    """An MP3File stand-in tagged "Test Artist - Test Track".
+
+    Specced against MP3File so a misspelled attribute fails loudly.
+    """
+    mock_mp3_file = Mock(spec=MP3File)
+    mock_mp3_file.metadata = {
+        "TPE1": "Test Artist",
+        "TIT2": "Test Track"
+    }
+    mock_mp3_file.parsed_filename = ("", "")  # No filename parsing needed
+    return mock_mp3_file
+
+
+@pytest.fixture
+def mb_mocks(monkeypatch, mp3_mock):
+    """Stub MusicBrainzDataSource's network methods and MP3File in one place.
+
+    Tests configure the returned mocks instead of stacking ``@patch``
+    decorators; ``mp3_file`` is the ``mp3_mock`` fixture.
+    """
+    mocks = SimpleNamespace(
+        search=Mock(),
+        find_matching_track=Mock(),
+        lookup_recording=Mock(),
+        extract_metadata=Mock(),
+        mp3_file=mp3_mock,
+    )
+    for name in ("search", "find_matching_track", "lookup_recording", "extract_metadata"):
+        monkeypatch.setattr(MusicBrainzDataSource, name, getattr(mocks, name))
+    monkeypatch.setattr('track_id.data_sources.MP3File', Mock(return_value=mp3_mock))
+    return mocks
+
+
+def test_search_musicbrainz_success(mock_musicbrainz_get):
+    """Test successful MusicBrainz search"""
+    mock_musicbrainz_get.response.payload = _SEARCH_RESULTS
     
-    @pytest.fixture
-    def runner(self):
-        """Create a CLI runner for testing"""
-        return CliRunner()
+    source = MusicBrainzDataSource()
+    result = source.search("test track")
     
+    assert result["recordings"][0]["title"] == "Test Track"
+    assert result["recordings"][0]["artist-credit"][0]["name"] == "Test Artist"
+    mock_musicbrainz_get.mock.assert_called_once()
+
+
+def test_session_retries_back_off_for_whole_seconds():
+    """Adapter retries skip the rate limiter, so they must not come back at once"""
+    retry = MusicBrainzDataSource()._session.get_adapter(MUSICBRAINZ_API_BASE).max_retries
+
+    assert retry.backoff_factor >= 1.0
+    assert retry.respect_retry_after_header is True
+
+
+def test_search_musicbrainz_error(mock_musicbrainz_get):
+    """Test MusicBrainz search with API error"""
+    mock_musicbrainz_get.response.status_code = 404
+    mock_musicbrainz_get.response.text = "Not Found"
     
-    @patch('track_id.musicbrainz_api.requests.get')
-    def test_search_musicbrainz_success(self, mock_get):
-        """Test successful MusicBrainz search"""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "recordings": [
-                {
-                    "id": "test-id-1",
-                    "title": "Test Track",
-                    "artist-credit": [{"name": "Test Artist"}]
-                }
-            ]
-        }
-        mock_get.return_value = mock_response
-        
-        source = MusicBrainzDataSource()
-        result = source.search("test track")
-        
-        assert result["recordings"][0]["title"] == "Test Track"
-        assert result["recordings"][0]["artist-credit"][0]["name"] == "Test Artist"
-        mock_get.assert_called_once()
+    source = MusicBrainzDataSource()
+    with pytest.raises(Exception) as exc_info:
+        source.search("test track")
     
-    @patch('track_id.musicbrainz_api.requests.get')
-    def test_search_musicbrainz_error(self, mock_get):
-        """Test MusicBrainz search with API error"""
-        # Mock failed API response
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-        mock_get.return_value = mock_response
-        
-        source = MusicBrainzDataSource()
-        with pytest.raises(Exception) as exc_info:
-            source.search("test track")
-        
-        assert "MusicBrainz API error: 404" in str(exc_info.value)
+    assert "MusicBrainz API error: 404" in str(exc_info.value)
+
+
+def test_search_musicbrainz_cached_per_query(mock_musicbrainz_get):
+    """Repeating a search is served from the cache without another request"""
+    mock_musicbrainz_get.response.payload = _SEARCH_RESULTS
+
+    source = MusicBrainzDataSource()
+    first = source.search("test track")
+    second = source.search("test track")
+
+    assert second is first
+    mock_musicbrainz_get.mock.assert_called_once()
+
+
+def test_search_musicbrainz_error_not_cached(mock_musicbrainz_get):
+    """A failed search is retried on the next call rather than cached"""
+    mock_musicbrainz_get.response.status_code = 503
+    source = MusicBrainzDataSource()
+    with pytest.raises(Exception):
+        source.search("test track")
+
+    mock_musicbrainz_get.response.status_code = 200
+    mock_musicbrainz_get.response.payload = _SEARCH_RESULTS
+    assert source.search("test track") is _SEARCH_RESULTS
+    assert mock_musicbrainz_get.mock.call_count == 2
+
+
+def test_search_musicbrainz_throttled_slows_later_requests(mock_musicbrainz_get):
+    """A 503 that outlasts the retries widens the spacing of later requests"""
+    mock_musicbrainz_get.response.status_code = 503
+    source = MusicBrainzDataSource()
+    with pytest.raises(Exception):
+        source.search("test track")
+
+    assert source._rate_limiter._min_interval == MUSICBRAINZ_THROTTLED_INTERVAL
+
+
+def test_lookup_recording_success(mock_musicbrainz_get):
+    """Test successful recording lookup"""
+    mock_musicbrainz_get.response.payload = {
+        "id": "test-id-1",
+        "title": "Test Track",
+        "artist-credit": [{"name": "Test Artist"}],
+        "releases": [{"title": "Test Album", "date": "2020-01-01"}],
+        "tags": [{"name": "rock", "count": 10}]
+    }
     
-    @patch('track_id.musicbrainz_api.requests.get')
-    def test_lookup_recording_success(self, mock_get):
-        """Test successful recording lookup"""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": "test-id-1",
-            "title": "Test Track",
-            "artist-credit": [{"name": "Test Artist"}],
-            "releases": [{"title": "Test Album", "date": "2020-01-01"}],
-            "tags": [{"name": "rock", "count": 10}]
-        }
-        mock_get.return_value = mock_response
-        
-        source = MusicBrainzDataSource()
-        result = source.lookup_recording("test-id-1")
-        
-        assert result["title"] == "Test Track"
-        assert result["releases"][0]["title"] == "Test Album"
-        mock_get.assert_called_once()
+    source = MusicBrainzDataSource()
+    result = source.lookup_recording("test-id-1")
     
-    def test_find_matching_track_success(self):
-        """Test finding matching track in search results"""
-        search_results = {
-            "recordings": [
-                {
-                    "id": "test-id-1",
-                    "title": "Test Track",
-                    "artist-credit": [{"name": "Test Artist"}]
-                },
-                {
-                    "id": "test-id-2", 
-                    "title": "Another Track",
-                    "artist-credit": [{"name": "Another Artist"}]
-                }
-            ]
-        }
-        
-        source = MusicBrainzDataSource()
-        result = source.find_matching_track(search_results, "Test Artist", "Test Track")
-        
-        assert result is not None
-        assert result["id"] == "test-id-1"
-        assert result["title"] == "Test Track"
+    assert result["title"] == "Test Track"
+    assert result["releases"][0]["title"] == "Test Album"
+    mock_musicbrainz_get.mock.assert_called_once()
+
+
+def test_find_matching_track_success():
+    """Test finding matching track in search results"""
+    search_results = {"recordings": [_RECORDING, _OTHER_RECORDING]}
     
-    def test_find_matching_track_no_match(self):
-        """Test finding matching track with no match"""
-        search_results = {
-            "recordings": [
-                {
-                    "id": "test-id-1",
-                    "title": "Different Track",
-                    "artist-credit": [{"name": "Different Artist"}]
-                }
-            ]
-        }
-        
-        source = MusicBrainzDataSource()
-        result = source.find_matching_track(search_results, "Test Artist", "Test Track")
-        
-        assert result is None
+    source = MusicBrainzDataSource()
+    result = source.find_matching_track(search_results, "Test Artist", "Test Track")
     
-    def test_extract_musicbrainz_metadata(self):
-        """Test extracting metadata from MusicBrainz recording data"""
-        recording_data = {
-            "title": "Test Track",
-            "artist-credit": [{"name": "Test Artist"}],
-            "releases": [
-                {
-                    "id": "release-abc-123",
-                    "title": "Test Album",
-                    "date": "2020-01-01"
-                }
-            ],
-            "tags": [
-                {"name": "rock", "count": 10},
-                {"name": "alternative", "count": 5}
-            ]
-        }
-
-        source = MusicBrainzDataSource()
-        metadata = source.extract_metadata(recording_data)
-
-        assert metadata["TIT2"] == "Test Track"
-        assert metadata["TPE1"] == "Test Artist"
-        assert metadata["TALB"] == "Test Album"
-        assert metadata["TDRC"] == "2020"
-        assert metadata["TCOM"] == "Test Artist"
-        assert "rock" in metadata["TXXX:GENRE"]
-        assert "alternative" in metadata["TXXX:GENRE"]
-        assert metadata["artwork_url"] == "https://coverartarchive.org/release/release-abc-123/front"
-
-    def test_extract_musicbrainz_metadata_no_artwork_without_release_id(self):
-        """No artwork_url should be set when the release has no MusicBrainz ID"""
-        recording_data = {
-            "title": "Test Track",
-            "artist-credit": [{"name": "Test Artist"}],
-            "releases": [{"title": "Test Album"}],
-        }
-
-        source = MusicBrainzDataSource()
-        metadata = source.extract_metadata(recording_data)
-
-        assert "artwork_url" not in metadata
-
-    def test_extract_musicbrainz_metadata_no_artwork_without_releases(self):
-        """No artwork_url should be set when the recording has no releases"""
-        recording_data = {
-            "title": "Test Track",
-            "artist-credit": [{"name": "Test Artist"}],
-        }
-
-        source = MusicBrainzDataSource()
-        metadata = source.extract_metadata(recording_data)
-
-        assert "artwork_url" not in metadata
+    assert result is not None
+    assert result["id"] == "test-id-1"
+    assert result["title"] == "Test Track"
+
+
+def test_find_matching_track_prefers_exact_over_earlier_partial():
+    """An exact hit beats a partial match listed before it"""
+    remix = {**_RECORDING, "id": "remix", "title": "Test Track (Remix)"}
+    search_results = {"recordings": [remix, _RECORDING]}
+
+    source = MusicBrainzDataSource()
+    result = source.find_matching_track(search_results, "Test Artist", "Test Track")
+
+    assert result["id"] == "test-id-1"
+
+
+def test_find_matching_track_no_match():
+    """Test finding matching track with no match"""
+    source = MusicBrainzDataSource()
+    result = source.find_matching_track(_SEARCH_RESULTS, "Different Artist", "Different Track")
     
-    @patch('track_id.data_sources.MP3File')
-    @patch('track_id.musicbrainz_api.MusicBrainzDataSource.search')
-    @patch('track_id.musicbrainz_api.MusicBrainzDataSource.find_matching_track')
-    @patch('track_id.musicbrainz_api.MusicBrainzDataSource.lookup_recording')
-    @patch('track_id.musicbrainz_api.MusicBrainzDataSource.extract_metadata')
-    def test_enrich_mp3_file_musicbrainz_success(
-        self, mock_extract, mock_lookup,
-        mock_find, mock_search, mock_mp3_file_class
-    ):
-        """Test successful MP3 enrichment with MusicBrainz"""
-        # Mock MP3File instance
-        mock_mp3_file = Mock()
-        mock_mp3_file.metadata = {
-            "TPE1": "Test Artist",
-            "TIT2": "Test Track"
-        }
-        mock_mp3_file.parsed_filename = ("", "")  # No filename parsing needed
-        mock_mp3_file.update_metadata.return_value = {
-            "TALB": "Test Album",
-            "TDRC": "2020"
-        }
-        mock_mp3_file_class.return_value = mock_mp3_file
-        
-        # Mock search results
-        mock_search.return_value = {"recordings": [
+    assert result is None
+
+
+def test_extract_musicbrainz_metadata():
+    """Test extracting metadata from MusicBrainz recording data"""
+    recording_data = {
+        "title": "Test Track",
+        "artist-credit": [{"name": "Test Artist"}],
+        "releases": [
             {
-                "id": "test-id-1",
-                "title": "Test Track",
-                "artist-credit": [{"name": "Test Artist"}]
+                "id": "release-abc-123",
+                "title": "Test Album",
+                "date": "2020-01-01"
             }
-        ]}
-        
-        # Mock matching track
-        mock_find.return_value = {"id": "test-id-1", "title": "Test Track"}
-        
-        # Mock detailed recording
-        mock_lookup.return_value = {
-            "id": "test-id-1",
-            "title": "Test Track",
-            "artist-credit": [{"name": "Test Artist"}]
-        }
-        
-        # Mock extracted metadata
-        mock_extract.return_value = {
-            "TIT2": "Test Track",
-            "TPE1": "Test Artist",
-            "TALB": "Test Album"
-        }
-        
-        source = MusicBrainzDataSource()
-        result = source.enrich_mp3_file("test.mp3")
-        
-        assert result["file_path"] == "test.mp3"
-        assert result["musicbrainz_metadata"]["TALB"] == "Test Album"
-        mock_search.assert_called_once()
-        mock_find.assert_called_once()
-        mock_lookup.assert_called_once()
-        mock_extract.assert_called_once()
-        mock_mp3_file.update_metadata.assert_called_once()
+        ],
+        "tags": [
+            {"name": "rock", "count": 10},
+            {"name": "alternative", "count": 5}
+        ]
+    }
+
+    source = MusicBrainzDataSource()
+    metadata = source.extract_metadata(recording_data)
+
+    assert metadata["TIT2"] == "Test Track"
+    assert metadata["TPE1"] == "Test Artist"
+    assert metadata["TALB"] == "Test Album"
+    assert metadata["TDRC"] == "2020"
+    assert metadata["TCOM"] == "Test Artist"
+    assert "rock" in metadata["TXXX:GENRE"]
+    assert "alternative" in metadata["TXXX:GENRE"]
+    assert metadata["artwork_url"] == "https://coverartarchive.org/release/release-abc-123/front"
+
+
+def test_extract_musicbrainz_metadata_includes_recording_id():
+    """The recording id is returned so it can be stored as a UFID frame"""
+    source = MusicBrainzDataSource()
+    metadata = source.extract_metadata({"id": "rec-123", "title": "Test Track"})
+
+    assert metadata[MUSICBRAINZ_RECORDING_ID_KEY] == "rec-123"
+
+
+def test_extract_musicbrainz_metadata_keeps_three_most_counted_tags():
+    """Only the three highest-count tags become the genre, most counted first"""
+    tags = [{"name": name, "count": count} for name, count in
+            [("pop", 1), ("rock", 9), ("jazz", 4), ("folk", 7), ("punk", 2)]]
+    source = MusicBrainzDataSource()
+    metadata = source.extract_metadata({"title": "Test Track", "tags": tags})
+
+    assert metadata["TXXX:GENRE"] == "rock, folk, jazz"
+
+
+def test_extract_musicbrainz_metadata_year_from_partial_and_malformed_dates():
+    """The year comes from the first four characters and must be four digits"""
+    source = MusicBrainzDataSource()
+
+    def year_of(date):
+        return source.extract_metadata({"releases": [{"date": date}]}).get("TDRC")
+
+    assert year_of("1999") == "1999"
+    assert year_of("1999-05") == "1999"
+    assert year_of("????-05-01") is None
+    assert year_of("99") is None
+
+
+def test_extract_musicbrainz_metadata_no_artwork_without_release_id():
+    """No artwork_url should be set when the release has no MusicBrainz ID"""
+    recording_data = {
+        "title": "Test Track",
+        "artist-credit": [{"name": "Test Artist"}],
+        "releases": [{"title": "Test Album"}],
+    }
+
+    source = MusicBrainzDataSource()
+    metadata = source.extract_metadata(recording_data)
+
+    assert "artwork_url" not in metadata
+
+
+def test_extract_musicbrainz_metadata_no_artwork_without_releases():
+    """No artwork_url should be set when the recording has no releases"""
+    recording_data = {
+        "title": "Test Track",
+        "artist-credit": [{"name": "Test Artist"}],
+    }
+
+    source = MusicBrainzDataSource()
+    metadata = source.extract_metadata(recording_data)
+
+    assert "artwork_url" not in metadata
+
+
+def test_enrich_mp3_file_musicbrainz_success(mb_mocks):
+    """Test successful MP3 enrichment with MusicBrainz"""
+    mb_mocks.mp3_file.update_metadata.return_value = {
+        "TALB": "Test Album",
+        "TDRC": "2020"
+    }
+    
+    # Mock search results
+    mb_mocks.search.return_value = _SEARCH_RESULTS
+    
+    # Mock matching track
+    mb_mocks.find_matching_track.return_value = {"id": "test-id-1", "title": "Test Track"}
+    
+    # Mock detailed recording
+    mb_mocks.lookup_recording.return_value = _RECORDING
+    
+    # Mock extracted metadata
+    mb_mocks.extract_metadata.return_value = {
+        "TIT2": "Test Track",
+        "TPE1": "Test Artist",
+        "TALB": "Test Album"
+    }
+    
+    source = MusicBrainzDataSource()
+    result = source.enrich_mp3_file("test.mp3")
+    
+    assert result["file_path"] == "test.mp3"
+    assert result["musicbrainz_metadata"]["TALB"] == "Test Album"
+    mb_mocks.search.assert_called_once()
+    mb_mocks.find_matching_track.assert_called_once()
+    mb_mocks.lookup_recording.assert_called_once()
+    mb_mocks.extract_metadata.assert_called_once()
+    mb_mocks.mp3_file.update_metadata.assert_called_once()
+
+
+def test_enrich_skips_lookup_when_search_result_has_releases(mb_mocks):
+    """A search hit that already carries releases is used without a lookup"""
+    match = {**_RECORDING, "releases": [{"id": "rel-1", "title": "Test Album"}]}
+    mb_mocks.search.return_value = {"recordings": [match]}
+    mb_mocks.find_matching_track.return_value = match
+    mb_mocks.extract_metadata.return_value = {"TALB": "Test Album"}
+
+    source = MusicBrainzDataSource()
+    result = source.enrich_mp3_file("test.mp3")
+
+    mb_mocks.lookup_recording.assert_not_called()
+    mb_mocks.extract_metadata.assert_called_once_with(match)
+    assert result["musicbrainz_track"] is match
+
+
+def test_enrich_uses_stored_recording_id_without_searching(mb_mocks):
+    """A file already tagged with a MusicBrainz recording id skips the search"""
+    mb_mocks.mp3_file.metadata[MUSICBRAINZ_RECORDING_ID_KEY] = "rec-123"
+    detailed = {"id": "rec-123", "title": "Test Track"}
+    mb_mocks.lookup_recording.return_value = detailed
+    mb_mocks.extract_metadata.return_value = {"TALB": "Test Album"}
+
+    source = MusicBrainzDataSource()
+    result = source.enrich_mp3_file("test.mp3")
+
+    mb_mocks.search.assert_not_called()
+    mb_mocks.find_matching_track.assert_not_called()
+    mb_mocks.lookup_recording.assert_called_once_with("rec-123")
+    assert result["search_query"] == "id:rec-123"
+    assert result["musicbrainz_track"] is detailed
+
+
+def test_enrich_mp3_file_musicbrainz_no_metadata(mb_mocks):
+    """Test enrichment with no existing metadata"""
+    mb_mocks.mp3_file.metadata = {}
     
-    @patch('track_id.data_sources.MP3File')
-    def test_enrich_mp3_file_musicbrainz_no_metadata(self, mock_mp3_file_class):
-        """Test enrichment with no existing metadata"""
-        # Mock MP3File instance with no metadata
-        mock_mp3_file = Mock()
-        mock_mp3_file.metadata = {}
-        mock_mp3_file.parsed_filename = ("", "")  # No filename parsing
-        mock_mp3_file_class.return_value = mock_mp3_file
-        
-        source = MusicBrainzDataSource()
-        with pytest.raises(ValueError) as exc_info:
-            source.enrich_mp3_file("test.mp3")
-        
-        assert "missing artist and title metadata" in str(exc_info.value)
+    source = MusicBrainzDataSource()
+    with pytest.raises(ValueError) as exc_info:
+        source.enrich_mp3_file("test.mp3")
     
-    @patch('track_id.data_sources.MP3File')
-    def test_enrich_mp3_file_musicbrainz_no_match(self, mock_mp3_file_class):
-        """Test enrichment with no matching track found"""
-        # Mock MP3File instance
-        mock_mp3_file = Mock()
-        mock_mp3_file.metadata = {
-            "TPE1": "Test Artist",
-            "TIT2": "Test Track"
-        }
-        mock_mp3_file.parsed_filename = ("", "")  # No filename parsing needed
-        mock_mp3_file_class.return_value = mock_mp3_file
-        
-        source = MusicBrainzDataSource()
-        
-        # Mock the search method to return empty results
-        with patch.object(source, 'search', return_value={"recordings": []}):
-            with patch.object(source, 'find_matching_track', return_value=None):
-                with pytest.raises(ValueError) as exc_info:
-                    source.enrich_mp3_file("test.mp3")
-
-                assert "No matching track found on MusicBrainz" in str(exc_info.value)
-
-    def test_txxx_genre_tag_written_to_file(self):
-        """TXXX:GENRE metadata from MusicBrainz must be persisted to the MP3 file"""
-        with tempfile.TemporaryDirectory() as tmp:
-            dest = os.path.join(tmp, 'test.mp3')
-            # A real audio frame is not required for this assertion:
-            # ID3 tags can be written to an empty .mp3 container.
-            with open(dest, "wb") as file_obj:
-                file_obj.write(b"")
-
-            mp3 = MP3File(dest)
-            mp3.update_metadata({'TXXX:GENRE': 'rock, alternative'})
-
-            id3 = ID3(dest)
-            assert 'TXXX:GENRE' in id3
-            assert 'rock' in id3['TXXX:GENRE'].text[0]
-            assert 'alternative' in id3['TXXX:GENRE'].text[0] 
\ No newline at end of file
+    assert "missing artist and title metadata" in str(exc_info.value)
+
+
+def test_enrich_mp3_file_musicbrainz_no_match(mb_mocks):
+    """Test enrichment with no matching track found"""
+    mb_mocks.search.return_value = {"recordings": []}
+    mb_mocks.find_matching_track.return_value = None
+    
+    source = MusicBrainzDataSource()
+    with pytest.raises(ValueError) as exc_info:
+        source.enrich_mp3_file("test.mp3")
+
+    assert "No matching track found on MusicBrainz" in str(exc_info.value)
+
+
+def test_txxx_genre_tag_written_to_file():
+    """TXXX:GENRE metadata from MusicBrainz must be persisted to the MP3 file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dest = os.path.join(tmp, 'test.mp3')
+        # A real audio frame is not required for this assertion:
+        # ID3 tags can be written to an empty .mp3 container.
+        with open(dest, "wb") as file_obj:
+            file_obj.write(b"")
+
+        mp3 = MP3File(dest)
+        mp3.update_metadata({'TXXX:GENRE': 'rock, alternative'})
+
+        id3 = ID3(dest)
+        assert 'TXXX:GENRE' in id3
+        assert 'rock' in id3['TXXX:GENRE'].text[0]
+        assert 'alternative' in id3['TXXX:GENRE'].text[0] 
+
+
+def test_recording_id_round_trips_through_ufid_frame(tmp_path):
+    """The recording id is written as Picard's UFID frame and read back"""
+    dest = tmp_path / "track.mp3"
+    dest.write_bytes(b"")
+
+    MP3File(str(dest)).update_metadata({MUSICBRAINZ_RECORDING_ID_KEY: 'rec-123'})
+
+    assert ID3(str(dest))[MUSICBRAINZ_RECORDING_ID_KEY].data == b'rec-123'
+    assert MP3File(str(dest)).metadata[MUSICBRAINZ_RECORDING_ID_KEY] == 'rec-123'
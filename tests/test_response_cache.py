@@ -0,0 +1,138 @@
+"""Tests for the on-disk API response cache."""
+
+import sqlite3
+
+import pytest
+
+from track_id import response_cache as response_cache_module
+from track_id.bandcamp_api import BandcampDataSource
+from track_id.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "cache" / "api.sqlite")
+
+
+class TestResponseCache:
+    def test_round_trip(self, cache):
+        cache.put("bandcamp:search", "Artist - Title", {"auto": {"results": []}})
+        assert cache.get("bandcamp:search", "Artist - Title") == {"auto": {"results": []}}
+
+    def test_miss_returns_none(self, cache):
+        assert cache.get("bandcamp:search", "never stored") is None
+
+    def test_namespaces_are_separate(self, cache):
+        cache.put("musicbrainz:recording", "q", {"source": "mb"})
+        assert cache.get("bandcamp:search", "q") is None
+
+    def test_expired_entry_is_a_miss(self, cache, monkeypatch):
+        cache.put("bandcamp:search", "q", {"a": 1})
+        now = response_cache_module.time.time()
+        monkeypatch.setattr(response_cache_module.time, "time", lambda: now + cache.ttl_seconds + 1)
+        assert cache.get("bandcamp:search", "q") is None
+
+    def test_expired_entries_deleted_on_open(self, cache, monkeypatch):
+        cache.put("bandcamp:search", "old", {"a": 1})
+        cache.put_bytes("artwork", "u", b"data")
+        now = response_cache_module.time.time()
+        monkeypatch.setattr(response_cache_module.time, "time", lambda: now + cache.ttl_seconds + 1)
+
+        ResponseCache(cache.path).get("bandcamp:search", "old")
+
+        with sqlite3.connect(str(cache.path)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 0
+
+    def test_refresh_skips_reads_but_stores(self, cache):
+        cache.put("bandcamp:search", "q", {"old": True})
+        cache.refresh = True
+        assert cache.get("bandcamp:search", "q") is None
+        cache.put("bandcamp:search", "q", {"new": True})
+        cache.refresh = False
+        assert cache.get("bandcamp:search", "q") == {"new": True}
+
+    def test_disabled_cache_neither_reads_nor_writes(self, cache):
+        cache.enabled = False
+        cache.put("bandcamp:search", "q", {"a": 1})
+        cache.enabled = True
+        assert cache.get("bandcamp:search", "q") is None
+
+    def test_schema_version_change_drops_entries(self, cache, monkeypatch):
+        cache.put("bandcamp:search", "q", {"a": 1})
+        monkeypatch.setattr(
+            response_cache_module, "_SCHEMA_VERSION", response_cache_module._SCHEMA_VERSION + 1
+        )
+
+        reopened = ResponseCache(cache.path)
+        assert reopened.get("bandcamp:search", "q") is None
+
+    def test_bytes_round_trip(self, cache):
+        cache.put_bytes("artwork", "https://example.com/a.jpg", b"\xff\xd8jpeg")
+
+        assert cache.get_bytes("artwork", "https://example.com/a.jpg") == b"\xff\xd8jpeg"
+        assert cache.get("artwork", "https://example.com/a.jpg") is None
+
+    def test_oldest_bytes_evicted_over_size_cap(self, cache):
+        cache.max_blob_bytes = 10
+        cache.put_bytes("artwork", "old", b"12345")
+        cache.put_bytes("artwork", "mid", b"12345")
+        cache.put_bytes("artwork", "new", b"12345")
+
+        assert cache.get_bytes("artwork", "old") is None
+        assert cache.get_bytes("artwork", "mid") == b"12345"
+        assert cache.get_bytes("artwork", "new") == b"12345"
+
+    def test_failed_write_is_rolled_back(self, cache, monkeypatch):
+        def fail(conn):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(cache, "_evict_blobs", fail)
+        cache.put_bytes("artwork", "u", b"data")
+        cache.put("bandcamp:search", "q", {"a": 1})
+
+        assert cache.get_bytes("artwork", "u") is None
+        assert cache.get("bandcamp:search", "q") == {"a": 1}
+
+    def test_clear_removes_bytes(self, cache):
+        cache.put_bytes("artwork", "u", b"data")
+        cache.clear()
+
+        assert cache.get_bytes("artwork", "u") is None
+
+    def test_unusable_path_disables_cache(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        cache = ResponseCache(blocker / "api.sqlite")
+
+        cache.put("bandcamp:search", "q", {"a": 1})
+
+        assert cache.get("bandcamp:search", "q") is None
+        assert cache.enabled is False
+
+    def test_clear_failure_is_logged_not_raised(self, cache, caplog):
+        cache.put("bandcamp:search", "q", {"a": 1})
+        cache._conn.execute("DROP TABLE blobs")
+
+        cache.clear()
+
+        assert "clear failed" in caplog.text
+
+    def test_clear(self, cache):
+        cache.put("bandcamp:search", "q", {"a": 1})
+        cache.clear()
+        assert cache.get("bandcamp:search", "q") is None
+
+
+def test_bandcamp_search_served_from_disk_across_instances(cache, monkeypatch, mock_bandcamp_post):
+    """A second process (fresh source instance) reuses the stored response"""
+    monkeypatch.setattr("track_id.bandcamp_api.response_cache", cache)
+    mock_bandcamp_post.response.payload = {"auto": {"results": []}}
+
+    BandcampDataSource().search("Artist - Title")
+    result = BandcampDataSource().search("Artist - Title")
+
+    assert result == {"auto": {"results": []}}
+    mock_bandcamp_post.mock.assert_called_once()
+    with sqlite3.connect(str(cache.path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 1
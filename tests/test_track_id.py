@@ -1,38 +1,46 @@
 import pytest
 import os
+import subprocess
+import sys
 import tempfile
 from unittest.mock import Mock, patch, mock_open
-from typer.testing import CliRunner
+from typer.main import get_command
 from track_id import app
 
+# Build the Click command tree once instead of on every runner.invoke.
+_CLICK_APP = get_command(app)
+
 
 class TestTrackIdCLI:
     """Test cases for the track-id CLI application"""
     
-    @pytest.fixture
-    def runner(self):
-        """Create a CLI runner for testing"""
-        return CliRunner()
-    
-    def test_search_command_exists(self, runner):
-        """Test that the search command exists"""
-        result = runner.invoke(app, ["search", "--help"])
-        assert result.exit_code == 0
-        assert "search" in result.output.lower()
-    
-    def test_info_command_exists(self, runner):
-        """Test that the info command exists"""
-        result = runner.invoke(app, ["info", "--help"])
-        assert result.exit_code == 0
-        assert "info" in result.output.lower()
+    @pytest.mark.parametrize("command", ["search", "info", "info-batch", "enrich", "enrich-batch", "download"])
+    def test_command_exists(self, command):
+        """Test that each command is registered on the app"""
+        assert command in _CLICK_APP.commands
     
-    def test_enrich_command_exists(self, runner):
-        """Test that the enrich command exists"""
-        result = runner.invoke(app, ["enrich", "--help"])
-        assert result.exit_code == 0
-        assert "enrich" in result.output.lower()
+    def test_import_defers_network_modules(self):
+        """Test that importing the CLI doesn't load requests or the data sources"""
+        code = (
+            "import sys, track_id; "
+            "assert 'requests' not in sys.modules; "
+            "assert 'track_id.unified_api' not in sys.modules; "
+            "assert track_id.BandcampDataSource.__name__ == 'BandcampDataSource'"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_import_defers_rich_progress_and_json(self):
+        """Test that the download-only and raw-JSON Rich modules load on first use"""
+        code = (
+            "import sys, track_id.display as d; "
+            "assert 'rich.progress' not in sys.modules; "
+            "assert 'rich.json' not in sys.modules; "
+            "d.make_download_progress(); "
+            "assert 'rich.progress' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
     
-    @patch('track_id.track_id.unified_search')
+    @patch('track_id.unified_api.search')
     def test_search_command_success(self, mock_search, runner):
         """Test search command with successful API response"""
         # Mock successful API response
@@ -53,25 +61,39 @@ class TestTrackIdCLI:
             }
         }
         
-        result = runner.invoke(app, ["search", "test track"])
+        result = runner.invoke(_CLICK_APP, ["search", "test track"])
         
         assert result.exit_code == 0
         mock_search.assert_called_once_with("test track")
     
-    @patch('track_id.track_id.unified_search')
+    @patch('track_id.unified_api.search')
+    def test_refresh_cache_option(self, mock_search, runner, monkeypatch):
+        """Test --refresh-cache makes the response cache skip reads for the run"""
+        from track_id.response_cache import response_cache
+        monkeypatch.setattr(response_cache, 'enabled', True)
+        monkeypatch.setattr(response_cache, 'refresh', False)
+        mock_search.return_value = {}
+
+        result = runner.invoke(_CLICK_APP, ["--refresh-cache", "search", "test track"])
+
+        assert result.exit_code == 0
+        assert response_cache.enabled is True
+        assert response_cache.refresh is True
+    
+    @patch('track_id.unified_api.search')
     def test_search_command_error(self, mock_search, runner):
         """Test search command with API error"""
         # Mock failed API response
         mock_search.side_effect = Exception("API Error")
         
-        result = runner.invoke(app, ["search", "test track"])
+        result = runner.invoke(_CLICK_APP, ["search", "test track"])
         
         assert result.exit_code == 1
         assert "API Error" in result.output
     
     def test_info_command_file_not_exists(self, runner):
         """Test info command with non-existent file"""
-        result = runner.invoke(app, ["info", "nonexistent.mp3"])
+        result = runner.invoke(_CLICK_APP, ["info", "nonexistent.mp3"])
         
         assert result.exit_code == 1
         assert "does not exist" in result.output
@@ -84,7 +106,7 @@ class TestTrackIdCLI:
             temp_file = f.name
         
         try:
-            result = runner.invoke(app, ["info", temp_file])
+            result = runner.invoke(_CLICK_APP, ["info", temp_file])
             assert result.exit_code == 1
             assert "not an MP3" in result.output
         finally:
@@ -109,7 +131,7 @@ class TestTrackIdCLI:
         }
         mock_mp3_file_class.return_value = mock_mp3_file
         
-        result = runner.invoke(app, ["info", "test.mp3"])
+        result = runner.invoke(_CLICK_APP, ["info", "test.mp3"])
         
         assert result.exit_code == 0
         assert "3:00" in result.output  # Duration
@@ -133,12 +155,12 @@ class TestTrackIdCLI:
         mock_mp3_file.metadata = {}
         mock_mp3_file_class.return_value = mock_mp3_file
         
-        result = runner.invoke(app, ["info", "test.mp3"])
+        result = runner.invoke(_CLICK_APP, ["info", "test.mp3"])
         
         assert result.exit_code == 0
         assert "no metadata tags found" in result.output
     
-    @patch('track_id.track_id.unified_enrich')
+    @patch('track_id.unified_api.enrich')
     @patch('track_id.track_id.MP3File')
     def test_enrich_command_success(self, mock_mp3_file_class, mock_enrich, runner):
         """Test enrich command with successful enrichment"""
@@ -211,7 +233,7 @@ class TestTrackIdCLI:
             }
         }
         
-        result = runner.invoke(app, ["enrich", "test.mp3"])
+        result = runner.invoke(_CLICK_APP, ["enrich", "test.mp3"])
         
         assert result.exit_code == 0
         assert "enriched" in result.output
@@ -220,7 +242,7 @@ class TestTrackIdCLI:
         assert "Test Album" in result.output
         assert "Added album artwork" in result.output
     
-    @patch('track_id.track_id.unified_enrich')
+    @patch('track_id.unified_api.enrich')
     @patch('track_id.track_id.MP3File')
     def test_enrich_command_error(self, mock_mp3_file_class, mock_enrich, runner):
         """Test enrich command with error"""
@@ -233,13 +255,13 @@ class TestTrackIdCLI:
         # Mock error
         mock_enrich.side_effect = ValueError("Cannot enrich file: missing artist (TPE1) or title (TIT2) metadata")
         
-        result = runner.invoke(app, ["enrich", "test.mp3"])
+        result = runner.invoke(_CLICK_APP, ["enrich", "test.mp3"])
         
         assert result.exit_code == 1
         assert "Error enriching MP3 file" in result.output
         assert "missing artist" in result.output
         
-    @patch('track_id.track_id.unified_enrich')
+    @patch('track_id.unified_api.enrich')
     @patch('track_id.track_id.MP3File')
     def test_enrich_command_with_artwork(self, mock_mp3_file_class, mock_enrich, runner):
         """Test enrich command with artwork functionality"""
@@ -312,10 +334,74 @@ class TestTrackIdCLI:
             }
         }
         
-        result = runner.invoke(app, ["enrich", "test.mp3"])
+        result = runner.invoke(_CLICK_APP, ["enrich", "test.mp3"])
         
         assert result.exit_code == 0
         assert "enriched" in result.output
         assert "Added album artwork" in result.output
         assert "image/jpeg" in result.output
-        
\ No newline at end of file
+        
+
+    def test_info_batch_command_reads_each_file(self, runner, tmp_path):
+        """Test info-batch describes readable files and reports unreadable ones"""
+        (tmp_path / "a.mp3").write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+        (tmp_path / "b.mp3").write_bytes(b"")
+
+        result = runner.invoke(_CLICK_APP, ["info-batch", str(tmp_path), "--workers", "2"])
+
+        assert result.exit_code == 0
+        assert "128 kbps" in result.output
+        assert "can't sync to MPEG frame" in " ".join(result.output.split())
+
+    def test_info_batch_command_not_a_directory(self, runner, tmp_path):
+        """Test info-batch rejects a path that is not a directory"""
+        result = runner.invoke(_CLICK_APP, ["info-batch", str(tmp_path / "missing")])
+
+        assert result.exit_code == 1
+        assert "Not a directory" in result.output
+
+    @patch('track_id.unified_api.enrich_batch')
+    def test_enrich_batch_command_success(self, mock_enrich_batch, runner, tmp_path):
+        """Test enrich-batch enriches the matching files and lists each one"""
+        (tmp_path / "a.mp3").write_bytes(b"")
+        (tmp_path / "b.mp3").write_bytes(b"")
+        (tmp_path / "notes.txt").write_text("")
+        mock_enrich_batch.side_effect = lambda paths, max_workers, force: {
+            path: {'success': path.endswith("a.mp3"), 'data': {}, 'error': 'No matching track found'}
+            for path in paths
+        }
+
+        result = runner.invoke(_CLICK_APP, ["enrich-batch", str(tmp_path), "--workers", "2"])
+
+        assert result.exit_code == 0
+        paths, = mock_enrich_batch.call_args[0]
+        assert paths == [str(tmp_path / "a.mp3"), str(tmp_path / "b.mp3")]
+        assert mock_enrich_batch.call_args[1] == {'max_workers': 2, 'force': False}
+        assert "1/2 files" in result.output
+        assert "No matching track found" in result.output
+
+    def test_enrich_batch_command_no_matching_files(self, runner, tmp_path):
+        """Test enrich-batch with a directory that has no MP3 files"""
+        result = runner.invoke(_CLICK_APP, ["enrich-batch", str(tmp_path)])
+
+        assert result.exit_code == 1
+        assert "No files matching" in result.output
+
+    @patch('track_id.unified_api.enrich')
+    def test_enrich_command_already_complete(self, mock_enrich, runner):
+        """Test enrich reports a skipped, already-complete file"""
+        mock_enrich.return_value = {
+            'file_path': 'test.mp3',
+            'search_query': 'Test Artist - Test Title',
+            'skipped': True,
+            'existing_metadata': {'TPE1': 'Test Artist', 'TIT2': 'Test Title'},
+            'successful_enrichment': None,
+            'all_results': {},
+        }
+
+        result = runner.invoke(_CLICK_APP, ["enrich", "test.mp3"])
+
+        assert result.exit_code == 0
+        assert "already complete" in result.output
+        assert "--force" in result.output
+        mock_enrich.assert_called_once_with("test.mp3", force=False)
@@ -1,6 +1,18 @@
 from .track_id import app
 from .id3_tags import ID3_TAG_NAMES
-from .musicbrainz_api import MusicBrainzDataSource
-from .bandcamp_api import BandcampDataSource
 
 __all__ = ['app', 'ID3_TAG_NAMES', 'MusicBrainzDataSource', 'BandcampDataSource']
+
+# Data sources are imported on first access (PEP 562) so CLI commands that
+# never query them don't pay for loading requests at startup.
+_LAZY_ATTRS = {
+    'MusicBrainzDataSource': '.musicbrainz_api',
+    'BandcampDataSource': '.bandcamp_api',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
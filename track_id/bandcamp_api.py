@@ -1,7 +1,8 @@
-import requests
 from typing import Dict, List, Optional, Any, Tuple
 from .mp3_utils import MP3File
-from .data_sources import DataSource
+from .data_sources import DataSource, RateLimiter, best_fuzzy_match, tokens_overlap, word_tokens
+from .http_utils import BROWSER_HEADERS, HTTP_TIMEOUT, create_session
+from .response_cache import response_cache
 
 
 class BandcampDataSource(DataSource):
@@ -9,29 +10,25 @@ class BandcampDataSource(DataSource):
     
     def __init__(self):
         super().__init__("Bandcamp")
+        # One session per source so repeated searches reuse the pooled
+        # keep-alive connection instead of a fresh TCP + TLS handshake.
+        self._session = create_session(BROWSER_HEADERS)
+        # Bandcamp publishes no limit, but enrich-batch runs several workers
+        # against one host; ~5 req/s keeps a large library from being throttled.
+        self._rate_limiter = RateLimiter(0.2)
+        # Search responses memoized per query for the life of the process, so
+        # tracks sharing an artist/title don't repeat the round trip.
+        self._search_cache: Dict[str, Dict[str, Any]] = {}
     
     def search(self, search_text: str) -> Dict[str, Any]:
         """Search for tracks on Bandcamp and return the raw API response"""
-        
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/123.0.6312.86 Safari/537.36"
-            ),
-            "Accept": (
-                "text/html,application/xhtml+xml,application/xml;"
-                "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
-            ),
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-        }
+        if search_text in self._search_cache:
+            return self._search_cache[search_text]
+
+        cached = response_cache.get('bandcamp:search', search_text)
+        if cached is not None:
+            self._search_cache[search_text] = cached
+            return cached
 
         payload = {
             'fan_id': None,
@@ -40,33 +37,57 @@ class BandcampDataSource(DataSource):
             'search_text': search_text
         }
 
-        response = requests.post(
+        self._rate_limiter.wait()
+        response = self._session.post(
             'https://bandcamp.com/api/bcsearch_public_api/1/autocomplete_elastic',
-            headers=headers, 
-            json=payload
+            json=payload,
+            timeout=HTTP_TIMEOUT
         )
         
         if response.status_code == 200:
-            return response.json()
+            self._search_cache[search_text] = response.json()
+            response_cache.put('bandcamp:search', search_text, self._search_cache[search_text])
+            return self._search_cache[search_text]
         else:
             raise Exception(f"Bandcamp API error: {response.status_code} - {response.text}")
 
     def find_matching_track(self, search_results: Dict[str, Any], artist: str, title: str) -> Optional[Dict[str, Any]]:
-        """Find the first track result that matches the given artist and title"""
+        """Find the track result that best matches the given artist and title.
+
+        An exact (case-insensitive) hit wins immediately; otherwise the first
+        partial match, then the closest fuzzy spelling.
+        """
         if 'auto' not in search_results:
             return None
         
-        # First, try to find exact track matches
-        for result in search_results['auto']['results']:
-            if result.get('type') == 't':
-                result_artist = result.get('band_name', '').lower()
-                result_title = result.get('name', '').lower()
-                
-                if (artist.lower() in result_artist or result_artist in artist.lower()) and \
-                   (title.lower() in result_title or result_title in title.lower()):
-                    return result
+        artist_cf = artist.casefold()
+        title_cf = title.casefold()
+        artist_tokens = word_tokens(artist)
+        title_tokens = word_tokens(title)
+
+        tracks = [r for r in search_results['auto']['results'] if r.get('type') == 't']
+
+        partial_match = None
+        for result in tracks:
+            result_artist = result.get('band_name', '')
+            result_title = result.get('name', '')
+
+            if result_artist.casefold() == artist_cf and result_title.casefold() == title_cf:
+                return result
+            
+            if partial_match is None and \
+               tokens_overlap(artist_tokens, word_tokens(result_artist)) and \
+               tokens_overlap(title_tokens, word_tokens(result_title)):
+                partial_match = result
         
-        return None
+        if partial_match is not None:
+            return partial_match
+
+        # Then fall back to the closest "artist title" spelling
+        return best_fuzzy_match(
+            [(f"{r.get('band_name', '')} {r.get('name', '')}", r) for r in tracks],
+            f"{artist} {title}",
+        )
 
     def extract_metadata(self, track_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract metadata from Bandcamp track data"""
@@ -1,11 +1,14 @@
 """Data source abstraction for unified search and enrichment."""
 
+import difflib
+import re
 import threading
 import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Any, Tuple
-from .mp3_utils import MP3File
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, FrozenSet, List, Optional, Any, Tuple, Union
+
+from .mp3_utils import MP3File, download_artwork
 
 
 class RateLimiter:
@@ -30,6 +33,75 @@ class RateLimiter:
                 time.sleep(remaining)
             self._last_call = time.monotonic()
 
+    def slow_down(self, min_interval: float) -> None:
+        """Widen the spacing to ``min_interval`` for the rest of the process."""
+        with self._lock:
+            self._min_interval = max(self._min_interval, min_interval)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after ``fail_max`` consecutive failures.
+
+    While a source is down, every file in a batch would otherwise wait out the
+    full timeout and retries before failing. Once open, calls fail immediately
+    with CircuitOpenError for ``reset_timeout`` seconds; the next call after
+    that is let through as a single trial, and its outcome closes or re-opens
+    the circuit. Calls made while the trial is in flight still fail fast, so
+    concurrent callers don't send a still-down source a burst of requests.
+    Retries (see http_utils) absorb a single flap; this handles a sustained
+    outage.
+    """
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 60.0):
+        self._name = name
+        self._fail_max = fail_max
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        is_trial = False
+        with self._lock:
+            if self._opened_at is not None:
+                remaining = self._reset_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"{self._name} skipped after {self._failures} consecutive failures; "
+                        f"retrying in {remaining:.0f}s"
+                    )
+                if self._trial_in_flight:
+                    raise CircuitOpenError(
+                        f"{self._name} skipped after {self._failures} consecutive failures; "
+                        "a trial request is in progress"
+                    )
+                # Half-open: let this call through as the only trial.
+                self._trial_in_flight = True
+                is_trial = True
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+                if is_trial or self._failures >= self._fail_max:
+                    self._opened_at = time.monotonic()
+            raise
+        else:
+            with self._lock:
+                self._failures = 0
+                if is_trial:
+                    self._opened_at = None
+            return result
+        finally:
+            if is_trial:
+                with self._lock:
+                    self._trial_in_flight = False
+
 
 def extract_artist_name_from_credits(artist_credits: List[Any]) -> str:
     """Extract artist name from various artist credit formats."""
@@ -46,6 +118,53 @@ def extract_artist_name_from_credits(artist_credits: List[Any]) -> str:
     return ' '.join(artist_names)
 
 
+_WORD_RE = re.compile(r'\w+')
+
+
+def word_tokens(text: str) -> FrozenSet[str]:
+    """Return the case-folded words of ``text`` as a set."""
+    return frozenset(_WORD_RE.findall(text.casefold()))
+
+
+def tokens_overlap(query: FrozenSet[str], candidate: FrozenSet[str]) -> bool:
+    """True if either word set contains the other — the "partial match" rule.
+
+    Whole-word containment accepts "Hoppipolla" for "Hoppipolla (Remastered)"
+    as substring containment would, but without also accepting "Air" for
+    "Fairport Convention". An empty side (unknown artist) matches anything.
+    """
+    return query <= candidate or candidate <= query
+
+
+def best_fuzzy_match(
+    candidates: List[Tuple[str, Any]], query: str, cutoff: float = 0.85
+) -> Optional[Any]:
+    """Return the candidate whose label is most similar to ``query``.
+
+    ``candidates`` are ``(label, item)`` pairs, compared case-folded with
+    difflib (as Discogs scoring does). Catches near-misses that word
+    containment rejects — accents, punctuation, doubled spaces — while the
+    cutoff keeps unrelated tracks out. Ties keep the earlier candidate, so the
+    search engine's relevance order breaks them. The cheap ``real_quick_ratio``
+    and ``quick_ratio`` upper bounds skip the full comparison for candidates
+    that cannot beat the current best.
+    """
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(query.casefold())
+    best_item = None
+    best_score = cutoff
+    found = False
+    for label, item in candidates:
+        matcher.set_seq1(label.casefold())
+        if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+            continue
+        score = matcher.ratio()
+        # The cutoff itself is a pass; after that a later result must do better.
+        if score > best_score or (not found and score == best_score):
+            best_item, best_score, found = item, score, True
+    return best_item
+
+
 def resolve_artist_title(mp3_file: MP3File) -> Tuple[str, str]:
     """Resolve artist and title from ID3 tags, falling back to the filename."""
     artist = mp3_file.metadata.get('TPE1', '')
@@ -65,11 +184,32 @@ def resolve_artist_title(mp3_file: MP3File) -> Tuple[str, str]:
     return artist, title
 
 
+# Tags every source can supply. A file that already has all of them (plus
+# cover art) has nothing to gain from a round trip to each source.
+COMPLETE_FIELDS = ('TIT2', 'TPE1', 'TALB', 'TDRC')
+
+
+def is_metadata_complete(metadata: Dict[str, str]) -> bool:
+    """Whether existing tags already cover COMPLETE_FIELDS and artwork."""
+    return (
+        all(metadata.get(key) for key in COMPLETE_FIELDS)
+        and any(key.startswith('APIC') for key in metadata)
+    )
+
+
+def _load_mp3_file(file: Union[str, MP3File]) -> Tuple[MP3File, str]:
+    """Return ``(mp3_file, path)``, loading the MP3File only when given a path."""
+    if isinstance(file, str):
+        return MP3File(file), file
+    return file, file.file_path
+
+
 class DataSource(ABC):
     """Abstract base class for all data sources."""
     
     def __init__(self, name: str):
         self.name = name
+        self._circuit = CircuitBreaker(name)
     
     @abstractmethod
     def search(self, search_text: str) -> Dict[str, Any]:
@@ -86,21 +226,31 @@ class DataSource(ABC):
         """Extract metadata from track data."""
         pass
     
-    def fetch_metadata(self, artist: str, title: str) -> Dict[str, Any]:
+    def fetch_metadata(
+        self, artist: str, title: str, existing_metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
         """Search this source and return the matched track and its metadata.
 
         Network-only: performs no file I/O, so it is safe to run concurrently
         for several sources against one MP3 file. The caller is responsible for
         merging the returned metadata and writing it to disk.
+
+        If ``existing_metadata`` already identifies the track on this source
+        (see _track_from_tags), the search and matching steps are skipped.
         """
-        search_text = self._build_search_query(artist, title)
-        search_results = self.search(search_text)
+        matching_track = self._track_from_tags(existing_metadata or {})
+        if matching_track:
+            search_text = f"id:{matching_track['id']}"
+        else:
+            search_text = self._build_search_query(artist, title)
+            # Network calls go through the breaker; "no match" is not a failure.
+            search_results = self._circuit.call(self.search, search_text)
 
-        matching_track = self.find_matching_track(search_results, artist, title)
-        if not matching_track:
-            raise ValueError(f"No matching track found on {self.name} for '{artist} - {title}'")
+            matching_track = self.find_matching_track(search_results, artist, title)
+            if not matching_track:
+                raise ValueError(f"No matching track found on {self.name} for '{artist} - {title}'")
 
-        detailed_track = self._get_detailed_track_info(matching_track)
+        detailed_track = self._circuit.call(self._get_detailed_track_info, matching_track)
         source_metadata = self.extract_metadata(detailed_track)
 
         return {
@@ -109,18 +259,18 @@ class DataSource(ABC):
             'source_metadata': source_metadata,
         }
 
-    def enrich_mp3_file(self, file_path: str) -> Dict[str, Any]:
+    def enrich_mp3_file(self, file_path: Union[str, MP3File]) -> Dict[str, Any]:
         """
         Enrich an MP3 file with metadata from this data source.
         This is the common implementation that all data sources can use.
+        Accepts an already-loaded MP3File so its parsed tags are reused.
         """
-        # Create MP3File instance
-        mp3_file = MP3File(file_path)
+        mp3_file, file_path = _load_mp3_file(file_path)
 
         artist, title = resolve_artist_title(mp3_file)
 
         # Search the source and extract metadata (network only)
-        fetched = self.fetch_metadata(artist, title)
+        fetched = self.fetch_metadata(artist, title, mp3_file.metadata)
         detailed_track = fetched['detailed_track']
         source_metadata = fetched['source_metadata']
 
@@ -149,6 +299,15 @@ class DataSource(ABC):
     def _get_detailed_track_info(self, track_data: Dict[str, Any]) -> Dict[str, Any]:
         """Get detailed track information. Override in subclasses if needed."""
         return track_data
+
+    def _track_from_tags(self, existing_metadata: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Return ``{'id': ...}`` for a track the file's tags already identify.
+
+        Sources that write their own track id back (e.g. a MusicBrainz UFID)
+        override this so re-enriching skips the search round trip; the
+        result is passed straight to _get_detailed_track_info.
+        """
+        return None
     
     def get_display_name(self) -> str:
         """Get the display name for this data source."""
@@ -184,33 +343,63 @@ data_source_registry = DataSourceRegistry()
 def search_all_sources(search_text: str) -> Dict[str, Any]:
     """Search all registered data sources and return combined results.
 
-    Run sequentially on purpose: each source makes a single request with no
-    rate-limit sleep to overlap, and the raw HTTP path serializes under the GIL
-    anyway, so a thread pool here adds complexity without reducing latency.
-    (Enrichment is different — its rate-limit sleeps do overlap, so
-    enrich_with_all_sources parallelizes.)
+    Sources are queried concurrently, since each waits on its own host's rate
+    limit and network round trip; results are keyed in registry order, and a
+    failing source is reported without affecting the others.
     """
-    results = {}
+    sources = data_source_registry.get_all_sources()
+    outcomes: Dict[str, Dict[str, Any]] = {}
 
-    for source in data_source_registry.get_all_sources():
-        try:
-            source_results = source.search(search_text)
-            results[source.name] = {
-                'success': True,
-                'data': source_results,
-                'source': source
-            }
-        except Exception as e:
-            results[source.name] = {
-                'success': False,
-                'error': str(e),
-                'source': source
+    if sources:
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            future_to_source = {
+                executor.submit(source.search, search_text): source
+                for source in sources
             }
+            for future in as_completed(future_to_source):
+                source = future_to_source[future]
+                try:
+                    outcomes[source.name] = {'success': True, 'data': future.result()}
+                except Exception as e:
+                    outcomes[source.name] = {'success': False, 'error': str(e)}
+
+    results = {}
+    for source in sources:
+        results[source.name] = {**outcomes[source.name], 'source': source}
 
     return results
 
 
-def enrich_with_all_sources(file_path: str) -> Dict[str, Any]:
+def _settled_artwork_url(
+    sources: List[DataSource],
+    fetched_by_source: Dict[str, Dict[str, Any]],
+    errors_by_source: Dict[str, str],
+) -> Optional[str]:
+    """The artwork URL the registry-order merge will pick, once it is certain.
+
+    Returns None while a source ahead of the first one offering artwork is
+    still pending, or when no source offers any.
+    """
+    for source in sources:
+        if source.name in errors_by_source:
+            continue
+        fetched = fetched_by_source.get(source.name)
+        if fetched is None:
+            return None
+        if 'artwork_url' in fetched['source_metadata']:
+            return fetched['source_metadata']['artwork_url'] or None
+    return None
+
+
+def _prefetch_failed(artwork_future: "Future[Optional[bytes]]") -> bool:
+    """Whether the artwork prefetch came back empty or raised."""
+    try:
+        return artwork_future.result() is None
+    except Exception:
+        return True
+
+
+def enrich_with_all_sources(file_path: Union[str, MP3File], force: bool = False) -> Dict[str, Any]:
     """Enrich an MP3 file using all available data sources.
 
     All sources are queried concurrently (they hit independent hosts and are
@@ -218,23 +407,39 @@ def enrich_with_all_sources(file_path: str) -> Dict[str, Any]:
     to provide a field wins — and written to the file in a single pass. This
     avoids both the serial latency of querying sources one by one and the
     repeated file writes / artwork downloads of writing per source.
+    Accepts an already-loaded MP3File so its parsed tags are reused.
+
+    Files whose tags are already complete (see is_metadata_complete) are
+    returned with ``skipped`` set and no source is queried, unless ``force``.
     """
-    mp3_file = MP3File(file_path)
+    mp3_file, file_path = _load_mp3_file(file_path)
     artist, title = resolve_artist_title(mp3_file)
     search_text = f"{artist} - {title}"
 
-    sources = data_source_registry.get_all_sources()
-
     # Snapshot existing metadata before the single write below.
     existing_metadata = dict(mp3_file.metadata)
 
+    if not force and is_metadata_complete(existing_metadata):
+        return {
+            'file_path': file_path,
+            'search_query': search_text,
+            'skipped': True,
+            'existing_metadata': existing_metadata,
+            'successful_enrichment': None,
+            'all_results': {},
+        }
+
+    sources = data_source_registry.get_all_sources()
+
     # Query every source concurrently. fetch_metadata does no file I/O.
     fetched_by_source: Dict[str, Dict[str, Any]] = {}
     errors_by_source: Dict[str, str] = {}
+    wants_artwork = not any(key.startswith('APIC') for key in existing_metadata)
+    artwork_future: Optional["Future[Optional[bytes]]"] = None
     if sources:
         with ThreadPoolExecutor(max_workers=len(sources)) as executor:
             future_to_source = {
-                executor.submit(source.fetch_metadata, artist, title): source
+                executor.submit(source.fetch_metadata, artist, title, existing_metadata): source
                 for source in sources
             }
             for future in as_completed(future_to_source):
@@ -244,6 +449,14 @@ def enrich_with_all_sources(file_path: str) -> Dict[str, Any]:
                 except Exception as e:
                     errors_by_source[source.name] = str(e)
 
+                # Start the cover download as soon as the winning URL is known,
+                # overlapping it with the slower sources; update_metadata below
+                # then finds it in download_artwork's cache.
+                if wants_artwork and artwork_future is None:
+                    artwork_url = _settled_artwork_url(sources, fetched_by_source, errors_by_source)
+                    if artwork_url:
+                        artwork_future = executor.submit(download_artwork, artwork_url)
+
     # Merge in registry order: the first source to supply a field wins.
     merged_metadata: Dict[str, Any] = {}
     for source in sources:
@@ -252,6 +465,11 @@ def enrich_with_all_sources(file_path: str) -> Dict[str, Any]:
             for key, value in fetched['source_metadata'].items():
                 merged_metadata.setdefault(key, value)
 
+    # A failed prefetch caches nothing, so update_metadata would download the
+    # same URL again and warn twice; leave the artwork out instead.
+    if artwork_future is not None and _prefetch_failed(artwork_future):
+        merged_metadata.pop('artwork_url', None)
+
     # Single write (and at most one artwork download) for all sources combined.
     added_metadata = mp3_file.update_metadata(merged_metadata) if merged_metadata else {}
 
@@ -293,3 +511,35 @@ def enrich_with_all_sources(file_path: str) -> Dict[str, Any]:
         'successful_enrichment': successful_enrichment,
         'all_results': enrichment_results
     }
+
+
+def enrich_many_with_all_sources(
+    file_paths: List[str], max_workers: int = 4, force: bool = False
+) -> Dict[str, Any]:
+    """Enrich several MP3 files concurrently, each via enrich_with_all_sources.
+
+    A library run is dominated by serial network latency, so files are spread
+    over a thread pool to overlap their round trips. Sources share their
+    session, response cache and RateLimiter across threads, so per-host limits
+    (MusicBrainz's 1 req/s, Bandcamp's ~5 req/s) still hold however many
+    workers are used; the work is I/O bound, so threads rather than processes.
+    Results are keyed by path in input order; one file failing does not stop
+    the rest.
+    """
+    outcomes: Dict[str, Any] = {}
+    if not file_paths:
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_path = {
+            executor.submit(enrich_with_all_sources, path, force=force): path
+            for path in file_paths
+        }
+        for future in as_completed(future_to_path):
+            path = future_to_path[future]
+            try:
+                outcomes[path] = {'success': True, 'data': future.result()}
+            except Exception as e:
+                outcomes[path] = {'success': False, 'error': str(e)}
+
+    return {path: outcomes[path] for path in file_paths}
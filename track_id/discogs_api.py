@@ -1,12 +1,13 @@
 """Discogs data source for music metadata enrichment."""
 
 import difflib
-import requests
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlencode
 from .data_sources import DataSource, RateLimiter
+from .http_utils import API_HEADERS, HTTP_TIMEOUT, create_session
+from .response_cache import response_cache
 
 DISCOGS_API_BASE = "https://api.discogs.com"
-USER_AGENT = "track-id/1.0.0 (https://github.com/vtasca/track-id)"
 
 
 class DiscogsDataSource(DataSource):
@@ -14,20 +15,24 @@ class DiscogsDataSource(DataSource):
 
     def __init__(self):
         super().__init__("Discogs")
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
-        })
+        self._session = create_session(API_HEADERS)
         # Stay within the 25 req/min unauthenticated limit; the limiter only
         # waits for the time remaining since this source's previous call.
         self._rate_limiter = RateLimiter(1.5)
 
     def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # A disk hit also skips the rate-limit wait below.
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        cached = response_cache.get('discogs', cache_key)
+        if cached is not None:
+            return cached
+
         self._rate_limiter.wait()
-        response = self._session.get(url, params=params)
+        response = self._session.get(url, params=params, timeout=HTTP_TIMEOUT)
         if response.status_code == 200:
-            return response.json()
+            body = response.json()
+            response_cache.put('discogs', cache_key, body)
+            return body
         raise Exception(f"Discogs API error: {response.status_code} - {response.text[:200]}")
 
     def search(self, search_text: str) -> Dict[str, Any]:
@@ -1,22 +1,21 @@
 """Display utilities for Rich console output formatting."""
 
-from typing import Dict, Any, List, Optional, Iterable, Tuple
+import functools
+import os
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Iterable, Tuple
 from rich import box
 from rich.console import Console
-from rich.json import JSON
-from rich.progress import (
-    BarColumn,
-    DownloadColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TransferSpeedColumn,
-)
 from rich.table import Table
 from rich.text import Text
 from .id3_tags import ID3_TAG_NAMES
 from .data_sources import extract_artist_name_from_credits
 
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
+# rich.progress and rich.json are imported by the few screens that use them
+# (download progress, raw search JSON) rather than on every command's startup.
+
 console = Console()
 
 
@@ -93,6 +92,30 @@ def _print_pairs(pairs: Iterable[Tuple[str, Any]]) -> None:
     console.print(table)
 
 
+def _single_write(func):
+    """Buffer everything a report prints and write it to the terminal once.
+
+    Rich's console is its own buffer context: prints inside it are rendered
+    as usual but held until the outermost context exits, so a multi-section
+    report reaches stdout in one write instead of one per section.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with console:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _print_lines(lines: List[Text]) -> None:
+    """Print several lines with one console.print.
+
+    Each print call pays Rich's full render pass, so ledgers that can run to
+    one line per file are joined and rendered once.
+    """
+    if lines:
+        console.print(Text("\n").join(lines))
+
+
 def _overflow(total: int, shown: int) -> None:
     """Quiet ``+K more`` line when a table has been truncated."""
     if total > shown:
@@ -107,16 +130,6 @@ def display_warning(message: str) -> None:
     console.print(line)
 
 
-def extract_artist_name_from_track_data(track_data: Dict[str, Any], source_type: str) -> str:
-    """Extract artist name from track data based on source type."""
-    if source_type == "bandcamp":
-        return track_data.get('band_name', 'Unknown')
-    elif source_type == "musicbrainz":
-        return extract_artist_name_from_credits(track_data.get('artist-credit', []))
-    else:
-        return track_data.get('artist', 'Unknown')
-
-
 # ---------------------------------------------------------------------------
 # Download command — live progress helpers.
 # ---------------------------------------------------------------------------
@@ -177,7 +190,7 @@ def display_request(username: str) -> None:
     console.print(req)
 
 
-def make_download_progress() -> Progress:
+def make_download_progress() -> "Progress":
     """A Progress styled in the download design system.
 
     The amber accent appears only here (the active download) and on the final
@@ -187,6 +200,15 @@ def make_download_progress() -> Progress:
         task = progress.add_task("waiting for a slot", user="", total=None, start=False)
         progress.update(task, description="downloading from", user=peer, total=size)
     """
+    from rich.progress import (
+        BarColumn,
+        DownloadColumn,
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+        TransferSpeedColumn,
+    )
+
     return Progress(
         SpinnerColumn(style=DL_MUTED),
         TextColumn("{task.description}", style=DL_MUTED),
@@ -255,9 +277,7 @@ def display_download_complete(dest_path: Any, enriched: bool = False) -> None:
 
 def display_file_info_table(file_info: Dict[str, Any]) -> None:
     """Display MP3 file information as a quiet key/value block."""
-    duration_seconds = file_info['duration_seconds']
-    minutes = int(duration_seconds // 60)
-    seconds = int(duration_seconds % 60)
+    minutes, seconds = divmod(int(file_info['duration_seconds']), 60)
     duration_str = f"{minutes}:{seconds:02d}"
 
     size = file_info['file_size']
@@ -332,7 +352,7 @@ def display_bandcamp_search_details(result: Dict[str, Any]) -> None:
 def display_musicbrainz_search_details(result: Dict[str, Any]) -> None:
     """Display MusicBrainz-specific search details."""
     recording = result['musicbrainz_recording']
-    artist_name = extract_artist_name_from_track_data(recording, "musicbrainz")
+    artist_name = extract_artist_name_from_credits(recording.get('artist-credit', []))
     section("musicbrainz", mark=None)
     _print_pairs([
         ("query", result['search_query']),
@@ -366,11 +386,14 @@ def display_discogs_search_details(result: Dict[str, Any]) -> None:
     _print_pairs(pairs)
 
 
+# Status notes update_metadata reports alongside real additions.
+_SKIPPED_PREFIXES = ('Artwork already exists', 'No new metadata')
+
+
 def filter_actual_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
     """Filter out skipped metadata entries to show only actual additions."""
     return {k: v for k, v in metadata.items()
-            if not str(v).startswith('Artwork already exists') and
-               not str(v).startswith('No new metadata')}
+            if not str(v).startswith(_SKIPPED_PREFIXES)}
 
 
 def _display_added_or_unchanged(added_metadata: Dict[str, Any]) -> None:
@@ -383,6 +406,7 @@ def _display_added_or_unchanged(added_metadata: Dict[str, Any]) -> None:
         console.print(Text("  all fields already had values", style=DL_FAINT))
 
 
+@_single_write
 def display_enrichment_results(result: Dict[str, Any], search_details_func: Any) -> None:
     """Display complete enrichment results using provided search details function."""
     search_details_func(result)
@@ -391,8 +415,16 @@ def display_enrichment_results(result: Dict[str, Any], search_details_func: Any)
         display_metadata_table(result['existing_metadata'], "existing metadata")
 
 
+@_single_write
 def display_unified_enrichment_results(result: Dict[str, Any]) -> None:
     """Display enrichment results from unified enrichment."""
+    if result.get('skipped'):
+        section("already complete", result['file_path'])
+        console.print(Text("  no sources queried — pass --force to enrich anyway", style=DL_FAINT))
+        display_metadata_table(result['existing_metadata'], "existing metadata")
+        console.print()
+        return
+
     successful = result['successful_enrichment']
 
     # Which source produced the winning enrichment.
@@ -418,6 +450,7 @@ def display_unified_enrichment_results(result: Dict[str, Any]) -> None:
 
     # A compact ledger of every source that was tried.
     section("sources", mark=None)
+    lines = []
     for name, source_result in result['all_results'].items():
         line = Text("  ")
         if source_result['success']:
@@ -427,7 +460,36 @@ def display_unified_enrichment_results(result: Dict[str, Any]) -> None:
             line.append(f"{_FAIL} ", style=ERROR)
             line.append(name, style=DL_MUTED)
             line.append(f"  {source_result['error']}", style=DL_FAINT)
-        console.print(line)
+        lines.append(line)
+    _print_lines(lines)
+    console.print()
+
+
+@_single_write
+def display_batch_enrichment_results(results: Dict[str, Any]) -> None:
+    """Display a one-line-per-file ledger (by file name) for the enrich-batch command."""
+    succeeded = sum(1 for r in results.values() if r['success'])
+    skipped = sum(1 for r in results.values() if r['success'] and r['data'].get('skipped'))
+    summary = f"{succeeded}/{len(results)} files"
+    if skipped:
+        summary += f" ({skipped} already complete)"
+    section("enriched", summary)
+    lines = []
+    for path, file_result in results.items():
+        line = Text("  ")
+        if file_result['success'] and file_result['data'].get('skipped'):
+            line.append("- ", style=DL_FAINT)
+            line.append(os.path.basename(path), style=DL_MUTED)
+            line.append("  already complete", style=DL_FAINT)
+        elif file_result['success']:
+            line.append(f"{_DONE} ", style=_ACCENT_BOLD)
+            line.append(os.path.basename(path), style=DL_TEXT)
+        else:
+            line.append(f"{_FAIL} ", style=ERROR)
+            line.append(os.path.basename(path), style=DL_MUTED)
+            line.append(f"  {file_result['error']}", style=DL_FAINT)
+        lines.append(line)
+    _print_lines(lines)
     console.print()
 
 
@@ -437,11 +499,14 @@ def display_unified_enrichment_results(result: Dict[str, Any]) -> None:
 
 def display_search_results(data: Any, title: str, color: str = "") -> None:
     """Display raw search results as JSON under a section header."""
+    from rich.json import JSON
+
     section(title)
     console.print(JSON.from_data(data))
     console.print()
 
 
+@_single_write
 def display_unified_search_results(results: Dict[str, Any], top_n: int = 3) -> None:
     """Display search results from all data sources in a clean summary format."""
     section("search", f"{len(results)} sources")
@@ -456,14 +521,16 @@ def display_unified_search_results(results: Dict[str, Any], top_n: int = 3) -> N
 
 
 def display_search_summary(source_name: str, data: Dict[str, Any], top_n: int = 3) -> None:
-    """Display a clean summary of search results for a specific data source."""
-    if source_name == "Bandcamp":
-        display_bandcamp_search_summary(data, top_n)
-    elif source_name == "MusicBrainz":
-        display_musicbrainz_search_summary(data, top_n)
-    elif source_name == "Discogs":
-        display_discogs_search_summary(data, top_n)
+    """Display a clean summary of search results for a specific data source.
+
+    Sources without a summary in _SEARCH_SUMMARIES fall back to raw JSON.
+    """
+    summary = _SEARCH_SUMMARIES.get(source_name)
+    if summary is not None:
+        summary(data, top_n)
     else:
+        from rich.json import JSON
+
         section(source_name.lower(), mark=None)
         console.print(JSON.from_data(data))
 
@@ -518,7 +585,7 @@ def display_musicbrainz_search_summary(data: Dict[str, Any], top_n: int = 3) ->
     table.add_column("id", style=DL_FAINT)
 
     for i, recording in enumerate(recordings[:top_n], 1):
-        artist_name = extract_artist_name_from_track_data(recording, "musicbrainz")
+        artist_name = extract_artist_name_from_credits(recording.get('artist-credit', []))
         title = recording.get('title', 'Unknown')
         release = ""
         if recording.get('releases'):
@@ -559,6 +626,14 @@ def display_discogs_search_summary(data: Dict[str, Any], top_n: int = 3) -> None
     _overflow(len(results), min(top_n, len(results)))
 
 
+# Per-source search summaries, by data source name.
+_SEARCH_SUMMARIES = {
+    "Bandcamp": display_bandcamp_search_summary,
+    "MusicBrainz": display_musicbrainz_search_summary,
+    "Discogs": display_discogs_search_summary,
+}
+
+
 # ---------------------------------------------------------------------------
 # Errors.
 # ---------------------------------------------------------------------------
@@ -0,0 +1,82 @@
+"""Shared HTTP configuration for the data sources and the artwork downloader."""
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    import requests
+
+# Identifies track-id to APIs that ask clients to name themselves
+# (MusicBrainz requires it, Discogs recommends it).
+USER_AGENT = "track-id/1.0.0 (https://github.com/vtasca/track-id)"
+
+# Sites without a public API (Bandcamp, its image CDN) expect a browser.
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.6312.86 Safari/537.36"
+)
+
+# Read-only so a caller can't mutate the headers every other session shares.
+API_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": USER_AGENT,
+    "Accept": "application/json",
+})
+
+BROWSER_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": BROWSER_USER_AGENT,
+    "Accept": (
+        "text/html,application/xhtml+xml,application/xml;"
+        "q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    # No "br": requests can only decode brotli when the optional brotli package
+    # is installed, which track-id doesn't depend on.
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+})
+
+# (connect, read) timeout for every data source request. Without one a stalled
+# server hangs an enrich indefinitely; the read bound caps tail latency.
+HTTP_TIMEOUT = (3.05, 10)
+
+
+def create_session(
+    headers: Mapping[str, str], backoff_factor: float = 0.25
+) -> "requests.Session":
+    """Build a data source session that retries transient failures.
+
+    429 and 5xx responses and dropped connections are retried up to four times.
+    urllib3 1.x re-sends the first retry at once and then waits
+    ``backoff_factor * 2 ** (n - 1)`` seconds (0s, 0.5s, 1s, 2s by default),
+    unless the response carries a ``Retry-After``, which is honoured instead.
+    These retries happen inside the adapter, below any per-source RateLimiter,
+    so sources with a strict request rate pass a larger ``backoff_factor``.
+    4xx "no match" answers are returned immediately. POST is
+    included because Bandcamp's search is a read-only POST. Once retries are
+    exhausted the last response is returned, so callers still report it as an
+    API error rather than a ``RetryError``.
+    """
+    # Imported here so commands that never touch the network (info) don't pay
+    # for loading requests.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=4,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.headers.update(headers)
+    return session
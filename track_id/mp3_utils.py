@@ -1,10 +1,50 @@
-import requests
 from typing import Dict, List, Optional, Any, Tuple
 from mutagen.mp3 import MP3
 from mutagen.id3 import ID3, ID3NoHeaderError, ID3TagError
-from mutagen.id3._frames import TIT2, TPE1, TPE2, TALB, TDRC, TCOM, TRCK, TCON, TPUB, TXXX, APIC
+from mutagen.id3._frames import TIT2, TPE1, TPE2, TALB, TDRC, TCOM, TRCK, TCON, TPUB, TXXX, UFID, APIC
+from .http_utils import BROWSER_USER_AGENT, HTTP_TIMEOUT, create_session
 import os
 import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+# Filename parsing: bracketed tags like "[Official Video]" are dropped, then
+# the first pattern that splits the rest into artist and title wins.
+_BRACKETED_RE = re.compile(r'\[.*?\]')
+_ARTIST_TITLE_PATTERNS = (
+    re.compile(r'^(.+?)\s*-\s*(.+)$'),  # artist - title, artist-title
+    re.compile(r'^(.+?)\s*:\s*(.+)$'),  # artist:title
+)
+
+# ID3 text frames that enrichment may fill in, by tag key
+_TAG_CLASSES = {
+    'TIT2': TIT2,
+    'TPE1': TPE1,
+    'TPE2': TPE2,
+    'TALB': TALB,
+    'TDRC': TDRC,
+    'TCOM': TCOM,
+    'TRCK': TRCK,
+    'TCON': TCON,
+    'TPUB': TPUB,
+    'TXXX': TXXX,
+}
+
+# Minimum free space left in a tag that had to grow, so later edits fit in place
+_MIN_TAG_PADDING = 4096
+
+
+def _tag_padding(info) -> int:
+    """Padding policy for ID3 saves: never shrink padding that still fits.
+
+    mutagen's default trims generous padding, which moves the audio data and
+    rewrites the whole file; keeping it means only the tag region is written.
+    """
+    if info.padding >= 0:
+        return info.padding
+    return max(_MIN_TAG_PADDING, info.get_default_padding())
 
 
 class MP3File:
@@ -21,15 +61,20 @@ class MP3File:
             FileNotFoundError: If the file doesn't exist
             ValueError: If the file is not an MP3 file
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File '{file_path}' does not exist")
+        # One stat both checks existence and gives the size for `info`
+        try:
+            file_size: Optional[int] = os.stat(file_path).st_size
+        except OSError:
+            raise FileNotFoundError(f"File '{file_path}' does not exist") from None
         
         if not file_path.lower().endswith('.mp3'):
             raise ValueError(f"File '{file_path}' is not an MP3 file")
         
         self.file_path = file_path
+        self._file_size = file_size
         self._info: Optional[Dict[str, Any]] = None
         self._metadata: Optional[Dict[str, str]] = None
+        self._id3: Optional[ID3] = None
         self._parsed_filename: Optional[Tuple[str, str]] = None
     
     @property
@@ -56,7 +101,12 @@ class MP3File:
     def _get_info(self) -> Dict[str, Any]:
         """Get basic information about the MP3 file."""
         audio = MP3(self.file_path)
-        file_size = os.path.getsize(self.file_path)
+        # MP3() parses the ID3 tags too; keep them so `metadata` needn't re-read.
+        if self._id3 is None and audio.tags is not None:
+            self._id3 = audio.tags
+        if self._file_size is None:
+            self._file_size = os.path.getsize(self.file_path)
+        file_size = self._file_size
         duration_seconds = audio.info.length if audio.info else 0
         
         return {
@@ -67,14 +117,30 @@ class MP3File:
             'sample_rate': getattr(audio.info, 'sample_rate', None) if audio.info else None
         }
     
+    def _load_id3(self) -> ID3:
+        """Parse the file's ID3 tags once and keep them for reads and updates.
+
+        A file without a tag header yields an empty ID3 that update_metadata
+        can fill in and save.
+        """
+        if self._id3 is None:
+            try:
+                self._id3 = ID3(self.file_path)
+            except (ID3NoHeaderError, ID3TagError):
+                self._id3 = ID3()
+        return self._id3
+    
     def _get_metadata(self) -> Dict[str, str]:
         """Get existing metadata from the MP3 file."""
         tags = {}
         try:
-            id3 = ID3(self.file_path)
+            id3 = self._load_id3()
             for key, value in id3.items():
                 if hasattr(value, 'text'):
                     tags[key] = value.text[0] if value.text else ""
+                elif key.startswith('UFID:'):
+                    # Unique file identifiers, e.g. the MusicBrainz recording id
+                    tags[key] = value.data.decode('ascii', 'replace')
                 elif key.startswith('APIC:'):
                     # Handle artwork tags
                     if hasattr(value, 'mime'):
@@ -92,16 +158,20 @@ class MP3File:
         # Remove .mp3 extension
         name_without_ext = os.path.splitext(filename)[0]
 
-        name_without_ext = re.sub(r'\[.*?\]', '', name_without_ext).strip()
-        
-        # Common patterns: artist - title, artist-title, artist:title
-        patterns = [
-            r'^(.+?)\s*-\s*(.+)$',  # artist - title
-            r'^(.+?)\s*:\s*(.+)$',  # artist:title
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, name_without_ext, re.IGNORECASE)
+        if '[' in name_without_ext:
+            name_without_ext = _BRACKETED_RE.sub('', name_without_ext)
+        name_without_ext = name_without_ext.strip()
+
+        # Fast path for the common "Artist - Title": splitting at the first
+        # dash gives the same result as the first pattern whenever both sides
+        # are non-blank; anything else falls through to the regexes.
+        artist, dash, title = name_without_ext.partition('-')
+        artist, title = artist.strip(), title.strip()
+        if dash and artist and title:
+            return artist, title
+
+        for pattern in _ARTIST_TITLE_PATTERNS:
+            match = pattern.match(name_without_ext)
             if match:
                 artist = match.group(1).strip()
                 title = match.group(2).strip()
@@ -127,47 +197,31 @@ class MP3File:
         added_metadata = {}
         
         try:
-            # Load existing ID3 tags or create new ones
-            try:
-                id3 = ID3(self.file_path)
-            except (ID3NoHeaderError, ID3TagError):
-                id3 = ID3()
-            
-            # Map of ID3 tag keys to their corresponding classes
-            tag_classes = {
-                'TIT2': TIT2,
-                'TPE1': TPE1,
-                'TPE2': TPE2,
-                'TALB': TALB,
-                'TDRC': TDRC,
-                'TCOM': TCOM,
-                'TRCK': TRCK,
-                'TCON': TCON,
-                'TPUB': TPUB,
-                'TXXX': TXXX,
-            }
+            # Reuse the tags parsed for self.metadata rather than re-reading the file
+            id3 = self._load_id3()
+            existing_metadata = self.metadata
             
             for key, value in new_metadata.items():
-                # Skip artwork_url as it's handled separately
-                if key == 'artwork_url':
-                    continue
-                    
                 # Only add if the field is empty in existing metadata
-                if key not in self.metadata or not self.metadata[key]:
-                    if key in tag_classes:
-                        id3[key] = tag_classes[key](encoding=3, text=value)
+                # (artwork_url has no tag class and is handled below)
+                if not existing_metadata.get(key):
+                    if key in _TAG_CLASSES:
+                        id3[key] = _TAG_CLASSES[key](encoding=3, text=value)
                         added_metadata[key] = value
                     elif key.startswith('TXXX:'):
                         desc = key.split(':', 1)[1]
                         id3[key] = TXXX(encoding=3, desc=desc, text=[value])
                         added_metadata[key] = value
+                    elif key.startswith('UFID:'):
+                        owner = key.split(':', 1)[1]
+                        id3[key] = UFID(owner=owner, data=value.encode('ascii'))
+                        added_metadata[key] = value
+            tags_changed = bool(added_metadata)
             
             # Handle artwork separately
             if 'artwork_url' in new_metadata and new_metadata['artwork_url']:
                 # Check if artwork already exists
-                existing_artwork = any(key.startswith('APIC') for key in id3.keys())
-                
-                if not existing_artwork:
+                if not id3.getall('APIC'):
                     # Only add artwork if none exists
                     artwork_data = download_artwork(new_metadata['artwork_url'])
                     if artwork_data:
@@ -183,92 +237,144 @@ class MP3File:
                             data=artwork_data
                         )
                         added_metadata['artwork'] = f'Added album artwork ({mime_type})'
+                        tags_changed = True
                 else:
                     # Artwork already exists, skip adding
                     added_metadata['artwork'] = 'Artwork already exists, skipped'
             
-            # Save the updated tags
-            id3.save(self.file_path)
-            
-            # Invalidate metadata cache since we've updated it
-            self._metadata = None
+            # Save the updated tags; a file with nothing new is left untouched
+            if tags_changed:
+                id3.save(self.file_path, padding=_tag_padding)
+                # Invalidate metadata cache since we've updated it; it is rebuilt
+                # from the saved in-memory tags without parsing the file again.
+                self._metadata = None
+                # The tags grew the file, so its size is stale too.
+                self._file_size = None
+                self._info = None
             
             return added_metadata
             
         except Exception as e:
+            # The in-memory tags may be half-updated; re-read them next time.
+            self._id3 = None
             raise Exception(f"Error updating MP3 metadata: {e}")
     
     def refresh_metadata(self):
         """Refresh the metadata cache by reloading from file."""
         self._metadata = None
+        self._id3 = None
     
     def refresh_info(self):
         """Refresh the info cache by reloading from file."""
         self._info = None
+        self._file_size = None
 
 MAX_ARTWORK_SIZE = 10 * 1024 * 1024  # 10 MB
+# Images are already compressed, so ask for them as-is rather than gzipped.
+_ARTWORK_HEADERS = {"User-Agent": BROWSER_USER_AGENT, "Accept-Encoding": "identity"}
+_ARTWORK_CHUNK_SIZE = 64 * 1024
+
+# One keep-alive session for all artwork downloads (Bandcamp's image CDN,
+# the Cover Art Archive), created on first use so reading tags never needs it.
+_artwork_session = None
+_artwork_session_lock = threading.Lock()
+
+
+def _get_artwork_session():
+    global _artwork_session
+    with _artwork_session_lock:
+        if _artwork_session is None:
+            _artwork_session = create_session(_ARTWORK_HEADERS)
+        return _artwork_session
+
+
+# Recently downloaded artwork by URL. Tracks from one album share a cover, so
+# a batch enrich downloads it once; a small LRU bounds the memory held. Across
+# runs the on-disk response cache serves the same role.
+_ARTWORK_CACHE_SIZE = 16
+_artwork_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_artwork_cache_lock = threading.Lock()
 
 
 def download_artwork(url: str) -> Optional[bytes]:
     """Download artwork from a URL and return the image data as bytes"""
+    # Imported here: reading tags (the info command) never needs sqlite.
+    from .response_cache import response_cache
+
+    with _artwork_cache_lock:
+        if url in _artwork_cache:
+            _artwork_cache.move_to_end(url)
+            return _artwork_cache[url]
+
+    data = response_cache.get_bytes('artwork', url)
+    if data is None:
+        data = _fetch_artwork(url)
+        if data is not None:
+            response_cache.put_bytes('artwork', url, data)
+    if data is not None:
+        with _artwork_cache_lock:
+            _artwork_cache[url] = data
+            if len(_artwork_cache) > _ARTWORK_CACHE_SIZE:
+                _artwork_cache.popitem(last=False)
+    return data
+
+
+def _fetch_artwork(url: str) -> Optional[bytes]:
+    """Stream artwork from a URL, giving up past MAX_ARTWORK_SIZE"""
     # Imported lazily: display -> data_sources -> mp3_utils would otherwise cycle.
     from .display import display_warning
 
     try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/123.0.6312.86 Safari/537.36"
-            ),
-        }
-
-        response = requests.get(url, headers=headers, timeout=10, stream=True)
-        response.raise_for_status()
-
-        content_length = response.headers.get('Content-Length')
-        if content_length and int(content_length) > MAX_ARTWORK_SIZE:
-            display_warning(f"artwork at {url} exceeds size limit, skipping")
-            return None
+        # Closing returns the connection to the shared pool even when an
+        # oversized body is abandoned half-read.
+        with _get_artwork_session().get(url, timeout=HTTP_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
 
-        chunks = []
-        downloaded = 0
-        for chunk in response.iter_content(chunk_size=8192):
-            downloaded += len(chunk)
-            if downloaded > MAX_ARTWORK_SIZE:
+            content_length = response.headers.get('Content-Length')
+            if content_length and int(content_length) > MAX_ARTWORK_SIZE:
                 display_warning(f"artwork at {url} exceeds size limit, skipping")
                 return None
-            chunks.append(chunk)
 
-        return b''.join(chunks)
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=_ARTWORK_CHUNK_SIZE):
+                if len(data) + len(chunk) > MAX_ARTWORK_SIZE:
+                    display_warning(f"artwork at {url} exceeds size limit, skipping")
+                    return None
+                data += chunk
+
+            return bytes(data)
     except Exception as e:
         display_warning(f"could not download artwork from {url}: {e}")
         return None
 
+
+# Artwork MIME types by leading magic bytes, then by URL extension.
+_EXTENSION_MIME_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+_MAGIC_MIME_TYPES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
 def get_mime_type(url: str, content: bytes) -> str:
-    """Detect MIME type from URL or content"""
-    # Try to get MIME type from URL extension
-    if url.lower().endswith('.png'):
-        return 'image/png'
-    elif url.lower().endswith('.jpg') or url.lower().endswith('.jpeg'):
-        return 'image/jpeg'
-    elif url.lower().endswith('.gif'):
-        return 'image/gif'
-    elif url.lower().endswith('.webp'):
-        return 'image/webp'
-    
-    # Try to detect from content magic bytes
-    if content.startswith(b'\xff\xd8\xff'):
-        return 'image/jpeg'
-    elif content.startswith(b'\x89PNG\r\n\x1a\n'):
-        return 'image/png'
-    elif content.startswith(b'GIF87a') or content.startswith(b'GIF89a'):
-        return 'image/gif'
-    elif content.startswith(b'RIFF') and content[8:12] == b'WEBP':
+    """Detect MIME type from content magic bytes, falling back to the URL"""
+    # The bytes are authoritative; a URL extension can be wrong or missing
+    for magic, mime_type in _MAGIC_MIME_TYPES:
+        if content.startswith(magic):
+            return mime_type
+    if content.startswith(b'RIFF') and content[8:12] == b'WEBP':
         return 'image/webp'
-    
-    # Default to JPEG
-    return 'image/jpeg'
+
+    # Otherwise trust the URL extension, defaulting to JPEG
+    ext_mime = _EXTENSION_MIME_TYPES.get(os.path.splitext(urlsplit(url).path)[1].lower())
+    return ext_mime or 'image/jpeg'
 
 def get_mp3_metadata(file_path: str) -> Dict[str, str]:
     """Get existing metadata from an MP3 file (backward compatibility function)"""
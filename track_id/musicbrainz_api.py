@@ -1,11 +1,23 @@
-import requests
-from typing import Dict, List, Optional, Any, Tuple, Union
+import heapq
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
 from .mp3_utils import MP3File
-from .data_sources import DataSource, RateLimiter, extract_artist_name_from_credits
+from .data_sources import (
+    DataSource,
+    RateLimiter,
+    best_fuzzy_match,
+    extract_artist_name_from_credits,
+    tokens_overlap,
+    word_tokens,
+)
+from .http_utils import API_HEADERS, HTTP_TIMEOUT, create_session
+from .response_cache import response_cache
 
 # MusicBrainz API configuration
 MUSICBRAINZ_API_BASE = "https://musicbrainz.org/ws/2"
-USER_AGENT = "track-id/1.0.0 (https://github.com/vtasca/track-id)"
+# ID3 frame holding the MusicBrainz recording id, as written by Picard
+MUSICBRAINZ_RECORDING_ID_KEY = "UFID:http://musicbrainz.org"
+# Request spacing once MusicBrainz keeps refusing requests after retries
+MUSICBRAINZ_THROTTLED_INTERVAL = 1.5
 
 
 class MusicBrainzDataSource(DataSource):
@@ -13,17 +25,31 @@ class MusicBrainzDataSource(DataSource):
 
     def __init__(self):
         super().__init__("MusicBrainz")
+        # Search and lookup hit the same host back to back; a shared session
+        # keeps that connection alive between them. Adapter retries bypass the
+        # rate limiter below, so they back off for whole seconds (0s, 2s, 4s,
+        # 8s, or the server's Retry-After) rather than the default quarter.
+        self._session = create_session(API_HEADERS, backoff_factor=1.0)
         # MusicBrainz allows max 1 request per second; the limiter only waits
         # for the time remaining since this source's previous call.
         self._rate_limiter = RateLimiter(1.0)
+        # Responses memoized per query for the life of the process: enriching
+        # an album repeats the same searches, and each miss costs a full
+        # rate-limited round trip. Errors raise and are never cached.
+        self._search_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lookup_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
     
     def search(self, search_text: str, entity_type: str = "recording") -> Dict[str, Any]:
         """Search for tracks on MusicBrainz and return the raw API response"""
-        
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json"
-        }
+        cache_key = (search_text, entity_type)
+        if cache_key in self._search_cache:
+            return self._search_cache[cache_key]
+
+        # A disk hit also skips the rate-limit wait below.
+        cached = response_cache.get(f'musicbrainz:{entity_type}', search_text)
+        if cached is not None:
+            self._search_cache[cache_key] = cached
+            return cached
 
         params: Dict[str, Union[str, int]] = {
             'query': search_text,
@@ -31,73 +57,106 @@ class MusicBrainzDataSource(DataSource):
             'limit': 25
         }
 
-        # Rate limiting: MusicBrainz requires max 1 request per second
-        self._rate_limiter.wait()
-
-        response = requests.get(
-            f'{MUSICBRAINZ_API_BASE}/{entity_type}',
-            headers=headers,
-            params=params
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"MusicBrainz API error: {response.status_code} - {response.text}")
+        self._search_cache[cache_key] = self._get(entity_type, params)
+        response_cache.put(f'musicbrainz:{entity_type}', search_text, self._search_cache[cache_key])
+        return self._search_cache[cache_key]
 
     def lookup_recording(self, recording_id: str, includes: Optional[List[str]] = None) -> Dict[str, Any]:
         """Look up detailed information about a specific recording"""
         
         if includes is None:
             includes = ['artists', 'releases', 'tags']
-        
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json"
-        }
 
         params: Dict[str, str] = {
             'fmt': 'json',
             'inc': '+'.join(includes)
         }
 
+        cache_key = (recording_id, params['inc'])
+        if cache_key in self._lookup_cache:
+            return self._lookup_cache[cache_key]
+
+        disk_key = f"{recording_id}?inc={params['inc']}"
+        cached = response_cache.get('musicbrainz:lookup', disk_key)
+        if cached is not None:
+            self._lookup_cache[cache_key] = cached
+            return cached
+
+        self._lookup_cache[cache_key] = self._get(f'recording/{recording_id}', params)
+        response_cache.put('musicbrainz:lookup', disk_key, self._lookup_cache[cache_key])
+        return self._lookup_cache[cache_key]
+
+    def _get(self, path: str, params: Mapping[str, Union[str, int]]) -> Dict[str, Any]:
+        """GET ``path`` under the API base at the allowed rate and return the JSON body"""
         # Rate limiting: MusicBrainz requires max 1 request per second
         self._rate_limiter.wait()
 
-        response = requests.get(
-            f'{MUSICBRAINZ_API_BASE}/recording/{recording_id}',
-            headers=headers,
-            params=params
+        response = self._session.get(
+            f'{MUSICBRAINZ_API_BASE}/{path}',
+            params=params,
+            timeout=HTTP_TIMEOUT
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
+
+        if response.status_code in (429, 503):
+            # Still "slow down" after the adapter's retries: space out the
+            # rest of this run's requests instead of tripping it again.
+            self._rate_limiter.slow_down(MUSICBRAINZ_THROTTLED_INTERVAL)
+        if response.status_code != 200:
             raise Exception(f"MusicBrainz API error: {response.status_code} - {response.text}")
+        return response.json()
 
     def find_matching_track(self, search_results: Dict[str, Any], artist: str, title: str) -> Optional[Dict[str, Any]]:
-        """Find the first track result that matches the given artist and title"""
+        """Find the recording that best matches the given artist and title.
+
+        An exact (case-insensitive) hit wins immediately; otherwise the first
+        partial match, then the closest fuzzy spelling.
+        """
         if 'recordings' not in search_results:
             return None
         
-        # First, try to find exact track matches
+        artist_cf = artist.casefold()
+        title_cf = title.casefold()
+        artist_tokens = word_tokens(artist)
+        title_tokens = word_tokens(title)
+
+        partial_match = None
         for recording in search_results['recordings']:
-            recording_title = recording.get('title', '').lower()
+            recording_title = recording.get('title', '')
+            # Only build the credit string for candidates whose title matches.
+            if not tokens_overlap(title_tokens, word_tokens(recording_title)):
+                continue
             recording_artist = extract_artist_name_from_credits(
                 recording.get('artist-credit', [])
-            ).lower()
-            
-            # Check if artist and title match (allowing partial matches)
-            if (artist.lower() in recording_artist or recording_artist in artist.lower()) and \
-               (title.lower() in recording_title or recording_title in title.lower()):
+            )
+
+            if recording_artist.casefold() == artist_cf and recording_title.casefold() == title_cf:
                 return recording
+            
+            # Check if artist matches too (allowing partial matches)
+            if partial_match is None and \
+               tokens_overlap(artist_tokens, word_tokens(recording_artist)):
+                partial_match = recording
         
-        return None
+        if partial_match is not None:
+            return partial_match
+
+        # Then fall back to the closest "artist title" spelling
+        return best_fuzzy_match(
+            [
+                (f"{extract_artist_name_from_credits(r.get('artist-credit', []))} {r.get('title', '')}", r)
+                for r in search_results['recordings']
+            ],
+            f"{artist} {title}",
+        )
 
     def extract_metadata(self, recording_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract metadata from MusicBrainz recording data"""
         metadata = {}
         
+        # Recording id, so the next run can look it up without searching
+        if recording_data.get('id'):
+            metadata[MUSICBRAINZ_RECORDING_ID_KEY] = recording_data['id']
+
         # Title
         if 'title' in recording_data:
             metadata['TIT2'] = recording_data['title']
@@ -115,13 +174,9 @@ class MusicBrainzDataSource(DataSource):
 
             # Year from release date
             if 'date' in release and release['date']:
-                # Extract year from date (format: YYYY-MM-DD or YYYY)
-                date_str = release['date']
-                if '-' in date_str:
-                    year = date_str.split('-')[0]
-                else:
-                    year = date_str
-                if year.isdigit():
+                # Dates are YYYY, YYYY-MM or YYYY-MM-DD; the year is the first four characters
+                year = release['date'][:4]
+                if len(year) == 4 and year.isdigit():
                     metadata['TDRC'] = year
 
             # Artwork from Cover Art Archive
@@ -140,8 +195,10 @@ class MusicBrainzDataSource(DataSource):
         # Tags/Genres
         if 'tags' in recording_data and recording_data['tags']:
             # Get the most popular tags
-            sorted_tags = sorted(recording_data['tags'], key=lambda x: x.get('count', 0), reverse=True)
-            top_tags = [tag['name'] for tag in sorted_tags[:3]]  # Top 3 tags
+            top_tags = [
+                tag['name']
+                for tag in heapq.nlargest(3, recording_data['tags'], key=lambda x: x.get('count', 0))
+            ]
             if top_tags:
                 metadata['TXXX:GENRE'] = ', '.join(top_tags)
 
@@ -151,8 +208,20 @@ class MusicBrainzDataSource(DataSource):
         """Build MusicBrainz-specific search query."""
         return f'artist:"{artist}" AND recording:"{title}"'
     
+    def _track_from_tags(self, existing_metadata: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Use the recording id a previous run (or Picard) stored in the file."""
+        recording_id = existing_metadata.get(MUSICBRAINZ_RECORDING_ID_KEY)
+        return {'id': recording_id} if recording_id else None
+
     def _get_detailed_track_info(self, track_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Get detailed recording information from MusicBrainz."""
+        """Get detailed recording information from MusicBrainz.
+
+        Recording search results already embed the artist credit, releases and
+        tags that extract_metadata reads, so the separate (rate-limited) lookup
+        is only made when the match came back without its releases.
+        """
+        if track_data.get('releases'):
+            return track_data
         recording_id = track_data['id']
         return self.lookup_recording(recording_id)
 
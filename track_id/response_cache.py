@@ -0,0 +1,194 @@
+"""Persistent on-disk cache for data source API responses and artwork.
+
+Enrichment is often re-run over the same files (a batch that partly failed,
+a cron job over a library), and every repeat search would otherwise cost a
+full, rate-limited round trip. Successful JSON responses are kept in a small
+SQLite database keyed by source and query, and reused for a week; cover art
+is kept alongside by URL, since every track of an album shares one image.
+Entries older than the TTL are deleted whenever the database is opened, so
+the file does not keep growing with every query ever made, and the oldest
+artwork is evicted once the images together exceed a size cap.
+
+The cache never breaks enrichment: if the database can't be opened or
+written, it logs the error and behaves as a miss from then on.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = Path.home() / ".cache" / "track-id" / "api.sqlite"
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+# Total size of cached artwork; a large library's covers would otherwise
+# reach gigabytes within the TTL.
+DEFAULT_MAX_BLOB_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# Bump when the cached payload shape changes; older entries are then dropped.
+_SCHEMA_VERSION = 2
+
+# Value column of each table; JSON responses are stored as text.
+_VALUE_COLUMNS = {"responses": "body", "blobs": "data"}
+
+
+class ResponseCache:
+    """A thread-safe SQLite store of JSON responses and binary blobs, namespaced per source.
+
+    ``enabled = False`` bypasses the cache entirely; ``refresh = True`` skips
+    reads but still stores fresh responses, overwriting stale ones.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_FILE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_blob_bytes: int = DEFAULT_MAX_BLOB_BYTES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_blob_bytes = max_blob_bytes
+        self.enabled = True
+        self.refresh = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database on first use, creating or migrating the schema."""
+        if self._conn is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+                if row is None or row[0] != str(_SCHEMA_VERSION):
+                    conn.execute("DROP TABLE IF EXISTS responses")
+                    conn.execute("DROP TABLE IF EXISTS blobs")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                        (str(_SCHEMA_VERSION),),
+                    )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " namespace TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " stored_at REAL NOT NULL,"
+                    " body TEXT NOT NULL,"
+                    " PRIMARY KEY (namespace, key))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    " namespace TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " stored_at REAL NOT NULL,"
+                    " data BLOB NOT NULL,"
+                    " PRIMARY KEY (namespace, key))"
+                )
+                # Expired rows would only ever be misses; drop them once per process.
+                cutoff = time.time() - self.ttl_seconds
+                for table in _VALUE_COLUMNS:
+                    conn.execute(f"DELETE FROM {table} WHERE stored_at < ?", (cutoff,))
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("response cache unavailable at %s: %s", self.path, e)
+                self.enabled = False
+        return self._conn
+
+    def _read(self, table: str, namespace: str, key: str) -> Optional[Any]:
+        if not self.enabled or self.refresh:
+            return None
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    f"SELECT stored_at, {_VALUE_COLUMNS[table]} FROM {table} "
+                    "WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("response cache read failed: %s", e)
+                return None
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return row[1]
+
+    def _write(self, table: str, namespace: str, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} "
+                    f"(namespace, key, stored_at, {_VALUE_COLUMNS[table]}) VALUES (?, ?, ?, ?)",
+                    (namespace, key, time.time(), value),
+                )
+                if table == "blobs":
+                    self._evict_blobs(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                # Don't leave a half-done insert/eviction for the next commit.
+                conn.rollback()
+                logger.warning("response cache write failed: %s", e)
+
+    def _evict_blobs(self, conn: sqlite3.Connection) -> None:
+        """Delete the oldest blobs until their total size fits max_blob_bytes."""
+        rows = conn.execute(
+            "SELECT rowid, length(data) FROM blobs ORDER BY stored_at DESC, rowid DESC"
+        ).fetchall()
+        total = 0
+        expired = []
+        for rowid, size in rows:
+            total += size
+            if total > self.max_blob_bytes:
+                expired.append((rowid,))
+        conn.executemany("DELETE FROM blobs WHERE rowid = ?", expired)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached JSON response for ``key``, or None if absent or expired."""
+        body = self._read("responses", namespace, key)
+        return None if body is None else json.loads(body)
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """Store a successful JSON response for ``key``."""
+        if not self.enabled:
+            return
+        self._write("responses", namespace, key, json.dumps(value))
+
+    def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        """Return cached binary content (e.g. artwork) for ``key``, or None."""
+        data = self._read("blobs", namespace, key)
+        return None if data is None else bytes(data)
+
+    def put_bytes(self, namespace: str, key: str, data: bytes) -> None:
+        """Store binary content (e.g. artwork) for ``key``."""
+        if not self.enabled:
+            return
+        self._write("blobs", namespace, key, sqlite3.Binary(data))
+
+    def clear(self) -> None:
+        """Remove every cached response and artwork."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM responses")
+                conn.execute("DELETE FROM blobs")
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.warning("response cache clear failed: %s", e)
+
+
+# Process-wide cache shared by all data sources.
+response_cache = ResponseCache()
@@ -1,7 +1,6 @@
-import asyncio
 import importlib.metadata
 from pathlib import Path
-from typing import NoReturn, Optional
+from typing import Any, Dict, List, NoReturn, Optional, Tuple, Union
 
 import typer
 
@@ -10,6 +9,7 @@ from .display import (
     collecting_text,
     connecting_text,
     console,
+    display_batch_enrichment_results,
     display_collected,
     display_download_complete,
     display_error,
@@ -28,8 +28,9 @@ from .display import (
     section,
 )
 from .mp3_utils import MP3File
-from .unified_api import enrich as unified_enrich
-from .unified_api import search as unified_search
+
+# The unified API (and with it requests and every data source) is imported
+# inside the commands that need it, so `info` and `--help` start quickly.
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
@@ -57,10 +58,23 @@ def root_callback(
         help="Show version and exit",
         callback=version_callback,
         is_eager=True
-    )
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Neither read nor store cached API responses"
+    ),
+    refresh_cache: bool = typer.Option(
+        False,
+        "--refresh-cache",
+        help="Ignore cached API responses and store fresh ones"
+    ),
 ) -> None:
     """Track ID - MP3 metadata enrichment tool"""
-    pass
+    if no_cache or refresh_cache:
+        from .response_cache import response_cache
+        response_cache.enabled = not no_cache
+        response_cache.refresh = refresh_cache
 
 @app.command()
 def search(
@@ -68,6 +82,7 @@ def search(
     top: int = typer.Option(3, "--top", "-t", help="Number of top results to show per source (default: 5)")
 ) -> None:
     """Search for tracks across all available data sources (Bandcamp, MusicBrainz)"""
+    from .unified_api import search as unified_search
 
     try:
         results = unified_search(search_text)
@@ -92,16 +107,90 @@ def info(file_path: str = typer.Argument(..., help="Path to the MP3 file")) -> N
         display_error(f"Error reading MP3 file: {e}")
         raise typer.Exit(1)
 
+def _collect_files(directory: Path, pattern: str, recursive: bool) -> List[str]:
+    """Sorted paths of the files matching ``pattern``; exits if there are none."""
+    if not directory.is_dir():
+        display_error(f"Not a directory: {directory}")
+        raise typer.Exit(1)
+
+    matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+    paths = sorted(str(p) for p in matches if p.is_file())
+    if not paths:
+        display_error(f"No files matching '{pattern}' in {directory}")
+        raise typer.Exit(1)
+    return paths
+
+def _read_mp3(file_path: str) -> Union[Tuple[Dict[str, Any], Dict[str, str]], str]:
+    """Parse one file's ``(info, tags)``, or return the error message.
+
+    Module-level so process pool workers can pickle it by name.
+    """
+    try:
+        mp3_file = MP3File(file_path)
+        return mp3_file.info, mp3_file.metadata
+    except Exception as e:
+        return str(e)
+
+@app.command("info-batch")
+def info_batch(
+    directory: Path = typer.Argument(..., help="Directory containing the MP3 files to describe"),
+    pattern: str = typer.Option("*.mp3", "--pattern", help="Glob pattern for files within the directory"),
+    recursive: bool = typer.Option(False, "--recursive", "-r", help="Also match files in subdirectories"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", min=1, help="Number of worker processes (default: one per CPU)"),
+) -> None:
+    """Display information about every matching MP3 file in a directory"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = _collect_files(directory, pattern, recursive)
+
+    # Tag parsing is CPU-bound pure Python, so files are read in separate
+    # processes; results come back in path order.
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, result in zip(paths, executor.map(_read_mp3, paths, chunksize=32)):
+            if isinstance(result, str):
+                display_error(f"Error reading {path}: {result}")
+                failures += 1
+                continue
+            file_info, metadata = result
+            display_file_info_table(file_info)
+            display_metadata_table(metadata)
+
+    if failures == len(paths):
+        raise typer.Exit(1)
+
 @app.command()
-def enrich(file_path: str = typer.Argument(..., help="Path to the MP3 file to enrich with metadata from all available sources")) -> None:
+def enrich(
+    file_path: str = typer.Argument(..., help="Path to the MP3 file to enrich with metadata from all available sources"),
+    force: bool = typer.Option(False, "--force", "-f", help="Query the sources even if the file's tags are already complete"),
+) -> None:
     """Enrich an MP3 file with metadata from all available data sources (Bandcamp, MusicBrainz)"""
+    from .unified_api import enrich as unified_enrich
+
     try:
-        result = unified_enrich(file_path)
+        result = unified_enrich(file_path, force=force)
         display_unified_enrichment_results(result)
     except Exception as e:
         display_error(f"Error enriching MP3 file: {e}")
         raise typer.Exit(1)
 
+@app.command("enrich-batch")
+def enrich_batch(
+    directory: Path = typer.Argument(..., help="Directory containing the MP3 files to enrich"),
+    pattern: str = typer.Option("*.mp3", "--pattern", help="Glob pattern for files within the directory"),
+    recursive: bool = typer.Option(False, "--recursive", "-r", help="Also match files in subdirectories"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Number of files enriched concurrently"),
+    force: bool = typer.Option(False, "--force", "-f", help="Query the sources even for files whose tags are already complete"),
+) -> None:
+    """Enrich every matching MP3 file in a directory from all available data sources"""
+    from .unified_api import enrich_batch as unified_enrich_batch
+
+    paths = _collect_files(directory, pattern, recursive)
+    results = unified_enrich_batch(paths, max_workers=workers, force=force)
+    display_batch_enrichment_results(results)
+    if not any(r['success'] for r in results.values()):
+        raise typer.Exit(1)
+
 @app.command()
 def download(
     search_text: str = typer.Argument(..., help="Track to download, e.g. 'Artist - Title'"),
@@ -114,9 +203,12 @@ def download(
     password: Optional[str] = typer.Option(None, "--password", "-p", envvar="SOULSEEK_PASSWORD", help="Soulseek password", show_default=False),
 ) -> None:
     """Download a track from Soulseek and optionally enrich it with metadata"""
+    import asyncio
+
     from .config import load_soulseek_config
     from .logging_setup import configure_logging
     from .soulseek_downloader import DownloadError, SoulseekDownloader
+    from .unified_api import enrich as unified_enrich
 
     log_file = configure_logging()
     display_log_path(log_file)
@@ -1,7 +1,12 @@
 """Unified API functions that work with all available data sources."""
 
-from typing import Dict, Any
-from .data_sources import data_source_registry, search_all_sources, enrich_with_all_sources
+from typing import Dict, Any, List
+from .data_sources import (
+    data_source_registry,
+    search_all_sources,
+    enrich_with_all_sources,
+    enrich_many_with_all_sources,
+)
 from .bandcamp_api import BandcampDataSource
 from .musicbrainz_api import MusicBrainzDataSource
 from .discogs_api import DiscogsDataSource
@@ -35,17 +40,33 @@ def search(query: str) -> Dict[str, Any]:
     return search_all_sources(query)
 
 
-def enrich(file_path: str) -> Dict[str, Any]:
+def enrich(file_path: str, force: bool = False) -> Dict[str, Any]:
     """
     Enrich an MP3 file using all available data sources.
     
     Args:
         file_path: Path to the MP3 file to enrich
+        force: Query the sources even if the file's tags are already complete
         
     Returns:
         Dictionary containing enrichment results from all data sources
     """
-    return enrich_with_all_sources(file_path)
+    return enrich_with_all_sources(file_path, force=force)
+
+
+def enrich_batch(file_paths: List[str], max_workers: int = 4, force: bool = False) -> Dict[str, Any]:
+    """
+    Enrich several MP3 files concurrently using all available data sources.
+    
+    Args:
+        file_paths: Paths to the MP3 files to enrich
+        max_workers: Number of files processed at once
+        force: Query the sources even for files whose tags are already complete
+        
+    Returns:
+        Dictionary mapping each path to its success flag and result or error
+    """
+    return enrich_many_with_all_sources(file_paths, max_workers=max_workers, force=force)
 
 
 # Initialize data sources when module is imported